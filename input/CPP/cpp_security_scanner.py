@@ -1,14 +1,18 @@
 #!/usr/bin/env python3
 
+import mmap
 import os
 import re
 import sys
-from typing import List, Dict, Tuple
+from typing import Iterator, List, Dict, Tuple
 from dataclasses import dataclass
 from pathlib import Path
 
-@dataclass
+@dataclass(frozen=True)
 class SecurityIssue:
+    # No per-instance __dict__; large scans create one of these per finding
+    __slots__ = ('file', 'line', 'severity', 'category', 'description', 'code')
+
     file: str
     line: int
     severity: str  # 'HIGH', 'MEDIUM', 'LOW'
@@ -16,71 +20,257 @@ class SecurityIssue:
     description: str
     code: str
 
+# Define patterns for common C++ security vulnerabilities
+PATTERNS = {
+    'buffer_overflow': [
+        (r'strcpy\s*\([^)]*\)', 'HIGH', 'Use of unsafe strcpy() - consider std::string'),
+        (r'strcat\s*\([^)]*\)', 'HIGH', 'Use of unsafe strcat() - consider std::string'),
+        (r'sprintf\s*\([^)]*\)', 'MEDIUM', 'Use of unsafe sprintf() - consider std::stringstream'),
+        (r'gets\s*\([^)]*\)', 'HIGH', 'Use of unsafe gets() - consider std::getline'),
+    ],
+    'memory_management': [
+        (r'new\s+\w+\s*\[[^]]+\]', 'MEDIUM', 'Raw array allocation - consider std::vector'),
+        (r'delete\s*\[[^]]*\]', 'LOW', 'Manual array deletion - consider smart pointers'),
+        (r'malloc\s*\([^)]*\)', 'HIGH', 'C-style memory allocation - use new or smart pointers'),
+        (r'free\s*\([^)]*\)', 'HIGH', 'C-style memory deallocation - use delete or smart pointers'),
+    ],
+    'exception_handling': [
+        (r'catch\s*\(\s*\.\.\.\s*\)', 'MEDIUM', 'Catching all exceptions may hide critical issues'),
+        (r'throw\s+\"[^\"]*\"', 'LOW', 'Throwing string literals - consider std::exception'),
+    ],
+    'input_validation': [
+        (r'cin\s*>>\s*[^;]+;', 'LOW', 'Check input validation and buffer limits'),
+        (r'scanf\s*\([^)]*\)', 'HIGH', 'Use of unsafe scanf() - consider std::cin'),
+    ],
+    'type_safety': [
+        (r'reinterpret_cast', 'MEDIUM', 'Dangerous type casting - ensure type safety'),
+        (r'const_cast', 'MEDIUM', 'Removing const qualifier - potential safety issue'),
+        (r'static_cast<void\s*\*>', 'MEDIUM', 'Unsafe void* casting'),
+    ],
+    'concurrency': [
+        (r'pthread_', 'LOW', 'Consider using std::thread instead of pthreads'),
+        (r'volatile', 'MEDIUM', 'Volatile may not be appropriate for concurrency'),
+    ],
+    'resource_management': [
+        (r'fopen\s*\([^)]*\)', 'MEDIUM', 'Use RAII with std::fstream instead'),
+        (r'FILE\s*\*', 'MEDIUM', 'Use std::fstream instead of C-style file handling'),
+    ],
+    'stl_usage': [
+        (r'vector\s*\.\s*at\s*\([^)]*\)', 'LOW', 'Consider bounds checking or iterator usage'),
+        (r'auto_ptr', 'HIGH', 'Deprecated auto_ptr usage - use unique_ptr'),
+    ]
+}
+
+# Larger files are skipped: generated or minified sources give no useful signal
+MAX_FILE_SIZE = 10 * 1024 * 1024
+# A NUL byte within this many leading bytes marks a file as binary
+BINARY_SNIFF_SIZE = 4096
+# Reports are written through a buffer this large in binary mode
+REPORT_BUFFER_SIZE = 1 << 20
+
+# Characters that stand for themselves outside a character class
+_LITERAL_CHARS = frozenset('_ -/:;,=<>!@#%&~\'"')
+
+def _literal_prefix(pattern: str) -> List[str]:
+    # Leading tokens that every match must start with, e.g. ['l', 'o', 'g', '\\.']
+    # for log\.Print.*token. Patterns with alternation are left alone.
+    tokens = []
+    if '|' in pattern:
+        return tokens
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '\\' and i + 1 < len(pattern) and not pattern[i + 1].isalnum():
+            token = pattern[i:i + 2]
+        elif char.isalnum() or char in _LITERAL_CHARS:
+            token = char
+        else:
+            break
+        # A quantified token is not fixed, so the prefix stops before it
+        following = pattern[i + len(token):i + len(token) + 1]
+        if following and following in '*+?{':
+            break
+        tokens.append(token)
+        i += len(token)
+    return tokens
+
+def _factor_alternation(patterns: List[str]) -> str:
+    # Join patterns into one alternation, sharing common literal prefixes the
+    # way a trie would: log\.Print.*password|log\.Print.*token becomes
+    # log\.Print(?:.*password|.*token), so the shared head is matched once
+    def build(entries):
+        parts = []
+        groups = {}
+        for tokens, rest in entries:
+            if tokens:
+                groups.setdefault(tokens[0], []).append((tokens, rest))
+            else:
+                parts.append(rest)
+        for group in groups.values():
+            if len(group) == 1:
+                tokens, rest = group[0]
+                parts.append(''.join(tokens) + rest)
+                continue
+            common = os.path.commonprefix([tokens for tokens, _ in group])
+            suffixes = build([(tokens[len(common):], rest) for tokens, rest in group])
+            parts.append(''.join(common) + '(?:' + suffixes + ')')
+        return '|'.join(parts)
+
+    entries = []
+    for pattern in patterns:
+        tokens = _literal_prefix(pattern)
+        rest = pattern[len(''.join(tokens)):]
+        entries.append((tokens, rest if tokens else '(?:' + pattern + ')'))
+    return build(entries)
+
+def _required_literal(pattern: str) -> bytes:
+    # The literal prefix unescaped, for a cheap substring test before the regex
+    return ''.join(token[-1] for token in _literal_prefix(pattern)).encode()
+
+def _unbounded_at(pattern: str, i: int) -> bool:
+    # Whether a quantifier allowing unlimited repeats (*, +, {n,}) starts at i
+    if pattern[i:i + 1] in ('*', '+'):
+        return True
+    if pattern[i:i + 1] == '{':
+        end = pattern.find('}', i)
+        return end != -1 and pattern[end - 1] == ',' and pattern[i + 1:end - 1].isdigit()
+    return False
+
+def _checked_pattern(pattern: str) -> str:
+    # Refuse patterns that repeat a group containing an unbounded quantifier,
+    # so a bad addition fails at start-up instead of hanging a scan. Only some
+    # of these backtrack exponentially, e.g. (a+)+ or (\s*)*, where the body
+    # overlaps its own repeats or can match the empty string. Telling those
+    # apart needs real regex analysis, so this check is deliberately
+    # conservative and also rejects safe patterns such as (?:\w+\.)+com;
+    # rewrite those without the nested repeat
+    outer = []
+    unbounded = False
+    in_class = False
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '\\':
+            i += 2
+            continue
+        if in_class:
+            in_class = char != ']'
+        elif char == '[':
+            in_class = True
+            # A ']' straight after '[' or '[^' is a literal member
+            if pattern[i + 1:i + 2] == '^':
+                i += 1
+            if pattern[i + 1:i + 2] == ']':
+                i += 1
+        elif char == '(':
+            outer.append(unbounded)
+            unbounded = False
+        elif char == ')' and outer:
+            if unbounded and _unbounded_at(pattern, i + 1):
+                raise ValueError(f"pattern {pattern!r} nests unbounded quantifiers")
+            unbounded = outer.pop() or unbounded
+        elif _unbounded_at(pattern, i):
+            unbounded = True
+        i += 1
+    return pattern
+
+# Compiled once per process as bytes and shared by every scanner instance;
+# the combined alternation lets a single pass over the mapped file find the
+# lines worth checking. The table is flattened into a tuple in report order
+# so the per-line check is a single loop, and holds bound search methods so
+# the loop does no attribute lookups.
+_COMPILED = tuple(
+    (category, _required_literal(pattern), re.compile(_checked_pattern(pattern).encode()).search, severity, desc)
+    for category, patterns in PATTERNS.items()
+    for pattern, severity, desc in patterns
+)
+_COMBINED_RE = re.compile(_factor_alternation([
+    pattern
+    for patterns in PATTERNS.values()
+    for pattern, _, _ in patterns
+]).encode())
+
 class CPPSecurityScanner:
-    def __init__(self):
-        # Define patterns for common C++ security vulnerabilities
-        self.patterns = {
-            'buffer_overflow': [
-                (r'strcpy\s*\([^)]*\)', 'HIGH', 'Use of unsafe strcpy() - consider std::string'),
-                (r'strcat\s*\([^)]*\)', 'HIGH', 'Use of unsafe strcat() - consider std::string'),
-                (r'sprintf\s*\([^)]*\)', 'MEDIUM', 'Use of unsafe sprintf() - consider std::stringstream'),
-                (r'gets\s*\([^)]*\)', 'HIGH', 'Use of unsafe gets() - consider std::getline'),
-            ],
-            'memory_management': [
-                (r'new\s+\w+\s*\[[^]]+\]', 'MEDIUM', 'Raw array allocation - consider std::vector'),
-                (r'delete\s*\[[^]]*\]', 'LOW', 'Manual array deletion - consider smart pointers'),
-                (r'malloc\s*\([^)]*\)', 'HIGH', 'C-style memory allocation - use new or smart pointers'),
-                (r'free\s*\([^)]*\)', 'HIGH', 'C-style memory deallocation - use delete or smart pointers'),
-            ],
-            'exception_handling': [
-                (r'catch\s*\(\s*\.\.\.\s*\)', 'MEDIUM', 'Catching all exceptions may hide critical issues'),
-                (r'throw\s+\"[^\"]*\"', 'LOW', 'Throwing string literals - consider std::exception'),
-            ],
-            'input_validation': [
-                (r'cin\s*>>\s*[^;]+;', 'LOW', 'Check input validation and buffer limits'),
-                (r'scanf\s*\([^)]*\)', 'HIGH', 'Use of unsafe scanf() - consider std::cin'),
-            ],
-            'type_safety': [
-                (r'reinterpret_cast', 'MEDIUM', 'Dangerous type casting - ensure type safety'),
-                (r'const_cast', 'MEDIUM', 'Removing const qualifier - potential safety issue'),
-                (r'static_cast<void\s*\*>', 'MEDIUM', 'Unsafe void* casting'),
-            ],
-            'concurrency': [
-                (r'pthread_', 'LOW', 'Consider using std::thread instead of pthreads'),
-                (r'volatile', 'MEDIUM', 'Volatile may not be appropriate for concurrency'),
-            ],
-            'resource_management': [
-                (r'fopen\s*\([^)]*\)', 'MEDIUM', 'Use RAII with std::fstream instead'),
-                (r'FILE\s*\*', 'MEDIUM', 'Use std::fstream instead of C-style file handling'),
-            ],
-            'stl_usage': [
-                (r'vector\s*\.\s*at\s*\([^)]*\)', 'LOW', 'Consider bounds checking or iterator usage'),
-                (r'auto_ptr', 'HIGH', 'Deprecated auto_ptr usage - use unique_ptr'),
-            ]
-        }
-
-    def scan_file(self, file_path: str) -> List[SecurityIssue]:
-        issues = []
+    patterns = PATTERNS
+
+    def scan_file(self, file_path: str) -> Iterator[SecurityIssue]:
+        # Findings are yielded as they are found so callers can stream them
         try:
-            with open(file_path, 'r') as f:
-                content = f.readlines()
-            
-            for line_num, line in enumerate(content, 1):
-                for category, patterns in self.patterns.items():
-                    for pattern, severity, desc in patterns:
-                        if re.search(pattern, line):
-                            issues.append(SecurityIssue(
-                                file=file_path,
-                                line=line_num,
-                                severity=severity,
-                                category=category,
-                                description=desc,
-                                code=line.strip()
-                            ))
+            with open(file_path, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                # mmap refuses zero-length files
+                if size == 0:
+                    return
+                if size > MAX_FILE_SIZE:
+                    print(f"Skipping {file_path}: larger than {MAX_FILE_SIZE} bytes", file=sys.stderr)
+                    return
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                    if content.find(b'\x00', 0, BINARY_SNIFF_SIZE) != -1:
+                        print(f"Skipping binary file {file_path}", file=sys.stderr)
+                        return
+                    # Text mode also ended lines at '\r' and '\r\n'; fold those
+                    # into '\n' so line numbers and contents match, copying the
+                    # file only when it has a '\r' at all
+                    if content.find(b'\r') != -1:
+                        content = content[:].replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+                    # Hoist the lookups used on every candidate line
+                    combined_search = _COMBINED_RE.search
+                    find, rfind = content.find, content.rfind
+                    compiled = _COMPILED
+                    issue = SecurityIssue
+                    size = len(content)
+
+                    # line_num is the number of the line starting at pos
+                    line_num = 1
+                    pos = 0
+                    while True:
+                        match = combined_search(content, pos)
+                        if match is None:
+                            break
+                        # Re-check the whole line so results match a per-line scan
+                        start = match.start()
+                        line_start = max(pos, rfind(b'\n', pos, start) + 1)
+                        line_end = find(b'\n', start) + 1 or size
+                        # Newlines are only counted in the gap since the last hit,
+                        # with a C-level count rather than a per-line table
+                        line_num += content[pos:line_start].count(b'\n')
+                        line = content[line_start:line_end]
+                        code = None
+                        for category, literal, search, severity, desc in compiled:
+                            # Most patterns can be ruled out by their literal alone
+                            if literal in line and search(line):
+                                if code is None:
+                                    code = line.decode('utf-8', 'replace').strip()
+                                yield issue(
+                                    file=file_path,
+                                    line=line_num,
+                                    severity=severity,
+                                    category=category,
+                                    description=desc,
+                                    code=code
+                                )
+                        pos = line_end
+                        line_num += 1
         except Exception as e:
             print(f"Error scanning file {file_path}: {str(e)}", file=sys.stderr)
-        
-        return issues
+
+def _report_lines(input_file: str, issues: Iterator[SecurityIssue]) -> Iterator[str]:
+    yield f"Security Scan Report for {input_file}\n"
+    yield "=" * 50 + "\n\n"
+
+    found = False
+    for issue in issues:
+        found = True
+        yield (
+            f"SEVERITY: {issue.severity}\n"
+            f"CATEGORY: {issue.category}\n"
+            f"LINE: {issue.line}\n"
+            f"DESCRIPTION: {issue.description}\n"
+            f"CODE: {issue.code}\n"
+            + "-" * 50 + "\n\n"
+        )
+    if not found:
+        yield "No security issues found.\n"
 
 def main():
     if len(sys.argv) != 3:
@@ -96,20 +286,11 @@ def main():
     # Create output directory if it doesn't exist
     os.makedirs(os.path.dirname(output_file), exist_ok=True)
     
-    with open(output_file, 'w') as f:
-        f.write(f"Security Scan Report for {input_file}\n")
-        f.write("=" * 50 + "\n\n")
-        
-        if not issues:
-            f.write("No security issues found.\n")
-        else:
-            for issue in issues:
-                f.write(f"SEVERITY: {issue.severity}\n")
-                f.write(f"CATEGORY: {issue.category}\n")
-                f.write(f"LINE: {issue.line}\n")
-                f.write(f"DESCRIPTION: {issue.description}\n")
-                f.write(f"CODE: {issue.code}\n")
-                f.write("-" * 50 + "\n\n")
+    # Findings are formatted as the scan produces them and handed to the file
+    # in one writelines call, so memory stays bounded by the write buffer.
+    # Binary mode skips the text layer; the large buffer keeps writes few.
+    with open(output_file, 'wb', buffering=REPORT_BUFFER_SIZE) as f:
+        f.writelines(part.encode() for part in _report_lines(input_file, issues))
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 
+import mmap
 import os
 import re
 import sys
@@ -7,8 +8,11 @@ from typing import List, Dict, Tuple
 from dataclasses import dataclass
 from pathlib import Path
 
-@dataclass
+@dataclass(frozen=True)
 class SecurityIssue:
+    # No per-instance __dict__; large scans create one of these per finding
+    __slots__ = ('file', 'line', 'severity', 'category', 'description', 'code')
+
     file: str
     line: int
     severity: str  # 'HIGH', 'MEDIUM', 'LOW'
@@ -16,6 +20,101 @@ class SecurityIssue:
     description: str
     code: str
 
+# One report entry, filled from a finding's fields in this order
+_ISSUE_TEMPLATE = (
+    "SEVERITY: {}\n"
+    "CATEGORY: {}\n"
+    "LINE: {}\n"
+    "DESCRIPTION: {}\n"
+    "CODE: {}\n"
+    + "-" * 50 + "\n\n"
+)
+
+# Larger files are skipped: generated or minified sources give no useful signal
+MAX_FILE_SIZE = 10 * 1024 * 1024
+# A NUL byte within this many leading bytes marks a file as binary
+BINARY_SNIFF_SIZE = 4096
+# Third-party code installed by Composer is not scanned
+VENDORED_DIRS = frozenset({'vendor'})
+VENDORED_SUFFIXES = ()
+
+# Characters that stand for themselves outside a character class
+_LITERAL_CHARS = frozenset('_ -/:;,=<>!@#%&~\'"')
+
+def _literal_prefix(pattern: str) -> List[str]:
+    # Leading tokens that every match must start with, e.g. ['l', 'o', 'g', '\\.']
+    # for log\.Print.*token. Patterns with alternation are left alone.
+    tokens = []
+    if '|' in pattern:
+        return tokens
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '\\' and i + 1 < len(pattern) and not pattern[i + 1].isalnum():
+            token = pattern[i:i + 2]
+        elif char.isalnum() or char in _LITERAL_CHARS:
+            token = char
+        else:
+            break
+        # A quantified token is not fixed, so the prefix stops before it
+        following = pattern[i + len(token):i + len(token) + 1]
+        if following and following in '*+?{':
+            break
+        tokens.append(token)
+        i += len(token)
+    return tokens
+
+def _required_literal(pattern: str) -> bytes:
+    # The literal prefix unescaped, for a cheap substring test before the regex
+    return ''.join(token[-1] for token in _literal_prefix(pattern)).encode()
+
+def _unbounded_at(pattern: str, i: int) -> bool:
+    # Whether a quantifier allowing unlimited repeats (*, +, {n,}) starts at i
+    if pattern[i:i + 1] in ('*', '+'):
+        return True
+    if pattern[i:i + 1] == '{':
+        end = pattern.find('}', i)
+        return end != -1 and pattern[end - 1] == ',' and pattern[i + 1:end - 1].isdigit()
+    return False
+
+def _checked_pattern(pattern: str) -> str:
+    # Refuse patterns that repeat a group containing an unbounded quantifier,
+    # so a bad addition fails at start-up instead of hanging a scan. Only some
+    # of these backtrack exponentially, e.g. (a+)+ or (\s*)*, where the body
+    # overlaps its own repeats or can match the empty string. Telling those
+    # apart needs real regex analysis, so this check is deliberately
+    # conservative and also rejects safe patterns such as (?:\w+\.)+com;
+    # rewrite those without the nested repeat
+    outer = []
+    unbounded = False
+    in_class = False
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '\\':
+            i += 2
+            continue
+        if in_class:
+            in_class = char != ']'
+        elif char == '[':
+            in_class = True
+            # A ']' straight after '[' or '[^' is a literal member
+            if pattern[i + 1:i + 2] == '^':
+                i += 1
+            if pattern[i + 1:i + 2] == ']':
+                i += 1
+        elif char == '(':
+            outer.append(unbounded)
+            unbounded = False
+        elif char == ')' and outer:
+            if unbounded and _unbounded_at(pattern, i + 1):
+                raise ValueError(f"pattern {pattern!r} nests unbounded quantifiers")
+            unbounded = outer.pop() or unbounded
+        elif _unbounded_at(pattern, i):
+            unbounded = True
+        i += 1
+    return pattern
+
 class PHPSecurityScanner:
     def __init__(self):
         # Define patterns for common PHP security vulnerabilities
@@ -83,24 +182,71 @@ class PHPSecurityScanner:
             ]
         }
 
+        # Compile every pattern once as bytes, and join all of them into a
+        # single alternation so one pass over the mapped file finds every
+        # candidate line
+        self._compiled = {
+            category: [(_required_literal(pattern), re.compile(_checked_pattern(pattern).encode()), severity, desc)
+                       for pattern, severity, desc in patterns]
+            for category, patterns in self.patterns.items()
+        }
+        self._combined = re.compile(b'|'.join(
+            b'(?:' + pattern.encode() + b')'
+            for patterns in self.patterns.values()
+            for pattern, _, _ in patterns
+        ))
+
     def scan_file(self, file_path: str) -> List[SecurityIssue]:
         issues = []
+        path = Path(file_path)
+        if VENDORED_DIRS.intersection(path.parts) or path.name.endswith(VENDORED_SUFFIXES):
+            print(f"Skipping vendored file {file_path}", file=sys.stderr)
+            return issues
         try:
-            with open(file_path, 'r') as f:
-                content = f.readlines()
-            
-            for line_num, line in enumerate(content, 1):
-                for category, patterns in self.patterns.items():
-                    for pattern, severity, desc in patterns:
-                        if re.search(pattern, line):
-                            issues.append(SecurityIssue(
-                                file=file_path,
-                                line=line_num,
-                                severity=severity,
-                                category=category,
-                                description=desc,
-                                code=line.strip()
-                            ))
+            with open(file_path, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                # mmap refuses zero-length files
+                if size == 0:
+                    return issues
+                if size > MAX_FILE_SIZE:
+                    print(f"Skipping {file_path}: larger than {MAX_FILE_SIZE} bytes", file=sys.stderr)
+                    return issues
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                    if content.find(b'\x00', 0, BINARY_SNIFF_SIZE) != -1:
+                        print(f"Skipping binary file {file_path}", file=sys.stderr)
+                        return issues
+                    # Text mode also ended lines at '\r' and '\r\n'; fold those
+                    # into '\n' so line numbers and contents match, copying the
+                    # file only when it has a '\r' at all
+                    if content.find(b'\r') != -1:
+                        content = content[:].replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+                    # line_num is the number of the line starting at pos
+                    line_num = 1
+                    pos = 0
+                    while True:
+                        match = self._combined.search(content, pos)
+                        if match is None:
+                            break
+                        # Re-check the whole line so results match a per-line scan
+                        line_start = max(pos, content.rfind(b'\n', pos, match.start()) + 1)
+                        line_end = content.find(b'\n', match.start()) + 1 or len(content)
+                        # Newlines are only counted in the gap since the last hit
+                        line_num += content[pos:line_start].count(b'\n')
+                        line = content[line_start:line_end]
+                        for category, patterns in self._compiled.items():
+                            for literal, regex, severity, desc in patterns:
+                                # Most patterns can be ruled out by their literal alone
+                                if literal in line and regex.search(line):
+                                    issues.append(SecurityIssue(
+                                        file=file_path,
+                                        line=line_num,
+                                        severity=severity,
+                                        category=category,
+                                        description=desc,
+                                        code=line.decode('utf-8', 'replace').strip()
+                                    ))
+                        pos = line_end
+                        line_num += 1
         except Exception as e:
             print(f"Error scanning file {file_path}: {str(e)}", file=sys.stderr)
         
@@ -128,12 +274,9 @@ def main():
             f.write("No security issues found.\n")
         else:
             for issue in issues:
-                f.write(f"SEVERITY: {issue.severity}\n")
-                f.write(f"CATEGORY: {issue.category}\n")
-                f.write(f"LINE: {issue.line}\n")
-                f.write(f"DESCRIPTION: {issue.description}\n")
-                f.write(f"CODE: {issue.code}\n")
-                f.write("-" * 50 + "\n\n")
+                f.write(_ISSUE_TEMPLATE.format(
+                    issue.severity, issue.category, issue.line, issue.description, issue.code
+                ))
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
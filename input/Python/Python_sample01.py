@@ -2,7 +2,8 @@
 
 import asyncio
 import concurrent.futures
-import functools
+import inspect
+import itertools
 import logging
 import multiprocessing
 import queue
@@ -10,6 +11,7 @@ import random
 import threading
 import time
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 from contextlib import asynccontextmanager, contextmanager
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
@@ -18,6 +20,7 @@ import weakref
 
 import aiofiles
 import aiohttp
+import numpy as np
 
 logging.basicConfig(
     level=logging.INFO,
@@ -27,6 +30,13 @@ logger = logging.getLogger(__name__)
 
 T = TypeVar('T')
 
+_SENTINEL = object()
+
+def _handler_ref(handler: Callable) -> Callable[[], Optional[Callable]]:
+    if inspect.ismethod(handler):
+        return weakref.WeakMethod(handler)
+    return lambda: handler
+
 @asynccontextmanager
 async def async_timer(name: str):
     start_time = time.time()
@@ -41,35 +51,42 @@ class AsyncRateLimiter:
     def __init__(self, rate: int, per: float):
         self.rate = rate
         self.per = per
-        self.allowance = rate
-        self.last_check = time.time()
+        self._token_cost = int(per * 1_000_000_000)
+        self._capacity = rate * self._token_cost
+        self.allowance = self._capacity
+        self.last_check = time.monotonic_ns()
         self._lock = asyncio.Lock()
     
     async def acquire(self):
-        async with self._lock:
-            current = time.time()
-            time_passed = current - self.last_check
-            self.last_check = current
-            
-            self.allowance += time_passed * (self.rate / self.per)
-            if self.allowance > self.rate:
-                self.allowance = self.rate
+        while True:
+            async with self._lock:
+                current = time.monotonic_ns()
+                time_passed = current - self.last_check
+                self.last_check = current
+                
+                self.allowance += time_passed * self.rate
+                if self.allowance > self._capacity:
+                    self.allowance = self._capacity
+                
+                if self.allowance >= self._token_cost:
+                    self.allowance -= self._token_cost
+                    return
+                
+                sleep_time = -(-(self._token_cost - self.allowance) // self.rate) / 1_000_000_000
             
-            if self.allowance < 1.0:
-                sleep_time = (1.0 - self.allowance) * (self.per / self.rate)
-                await asyncio.sleep(sleep_time)
-                self.allowance = 0.0
-            else:
-                self.allowance -= 1.0
+            await asyncio.sleep(sleep_time)
 
 class AsyncTaskQueue(Generic[T]):
-    def __init__(self, max_workers: int = 5, max_queue_size: int = 100):
+    def __init__(self, max_workers: int = 5, max_queue_size: int = 100, max_results: int = 1000):
         self.max_workers = max_workers
+        self.max_results = max_results
         self.queue = asyncio.Queue(maxsize=max_queue_size)
         self.workers: List[asyncio.Task] = []
-        self.results: Dict[str, Any] = {}
+        self.results: OrderedDict[str, asyncio.Future] = OrderedDict()
         self.running = False
-        self._task_counter = 0
+        self._task_counter = itertools.count().__next__
+        self._pending: List[tuple] = []
+        self._flush_task: Optional[asyncio.Task] = None
     
     async def start_workers(self):
         self.running = True
@@ -82,62 +99,83 @@ class AsyncTaskQueue(Generic[T]):
     async def stop_workers(self):
         self.running = False
         
-        for worker in self.workers:
-            worker.cancel()
+        if self._flush_task is not None:
+            await self._flush_task
+        await self._flush_pending()
+        for _ in self.workers:
+            await self.queue.put(_SENTINEL)
         
         await asyncio.gather(*self.workers, return_exceptions=True)
         logger.info("All workers stopped")
     
     async def submit_task(self, coro: Callable[..., T], *args, **kwargs) -> str:
-        task_id = f"task-{self._task_counter}"
-        self._task_counter += 1
-        
-        await self.queue.put({
-            'id': task_id,
-            'coro': coro,
-            'args': args,
-            'kwargs': kwargs
-        })
+        task_id = f"task-{self._task_counter()}"
+        future = asyncio.get_running_loop().create_future()
+        self.results[task_id] = future
+        if len(self.results) > self.max_results:
+            dropped_id, _ = self.results.popitem(last=False)
+            logger.warning(f"Dropping unclaimed result for {dropped_id}")
+        
+        self._pending.append((task_id, coro, args, kwargs, future))
+        if self._flush_task is None:
+            self._flush_task = asyncio.get_running_loop().create_task(self._drain_pending())
+        await asyncio.shield(self._flush_task)
         
         return task_id
     
-    async def get_result(self, task_id: str, timeout: float = 10.0) -> T:
-        deadline = time.time() + timeout
+    async def _drain_pending(self):
+        try:
+            while self._pending:
+                await self._flush_pending()
+        finally:
+            self._flush_task = None
+    
+    async def _flush_pending(self):
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
         
-        while time.time() < deadline:
-            if task_id in self.results:
-                result = self.results.pop(task_id)
-                if isinstance(result, Exception):
-                    raise result
-                return result
-            
-            await asyncio.sleep(0.1)
+        batch_size = -(-len(pending) // self.max_workers)
+        for i in range(0, len(pending), batch_size):
+            await self.queue.put(pending[i:i + batch_size])
+    
+    async def get_result(self, task_id: str, timeout: float = 10.0) -> T:
+        future = self.results.pop(task_id, None)
+        if future is None:
+            raise KeyError(f"Unknown task {task_id}")
         
-        raise TimeoutError(f"Task {task_id} did not complete within {timeout} seconds")
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"Task {task_id} did not complete within {timeout} seconds")
     
     async def _worker(self, worker_name: str):
         logger.info(f"{worker_name} started")
         
-        while self.running:
+        while True:
             try:
-                task = await asyncio.wait_for(self.queue.get(), timeout=1.0)
-                
-                logger.info(f"{worker_name} processing {task['id']}")
+                batch = await self.queue.get()
+                if batch is _SENTINEL:
+                    self.queue.task_done()
+                    break
                 
                 try:
-                    result = await task['coro'](*task['args'], **task['kwargs'])
-                    self.results[task['id']] = result
-                    logger.info(f"{worker_name} completed {task['id']}")
-                    
-                except Exception as e:
-                    logger.error(f"{worker_name} error in {task['id']}: {e}")
-                    self.results[task['id']] = e
+                    for task_id, coro, args, kwargs, future in batch:
+                        logger.info(f"{worker_name} processing {task_id}")
+                        
+                        try:
+                            result = await coro(*args, **kwargs)
+                            if not future.done():
+                                future.set_result(result)
+                            logger.info(f"{worker_name} completed {task_id}")
+                            
+                        except Exception as e:
+                            logger.error(f"{worker_name} error in {task_id}: {e}")
+                            if not future.done():
+                                future.set_exception(e)
                 
                 finally:
                     self.queue.task_done()
-                    
-            except asyncio.TimeoutError:
-                continue
             
             except Exception as e:
                 logger.error(f"{worker_name} unexpected error: {e}")
@@ -148,53 +186,46 @@ class AsyncConnectionPool:
     def __init__(self, max_connections: int = 10, timeout: float = 30.0):
         self.max_connections = max_connections
         self.timeout = timeout
-        self.pool = asyncio.Queue(maxsize=max_connections)
-        self.created_connections = 0
-        self._lock = asyncio.Lock()
+        self._session: Optional[aiohttp.ClientSession] = None
     
     async def get_connection(self) -> aiohttp.ClientSession:
-        try:
-            session = self.pool.get_nowait()
-            if not session.closed:
-                return session
-        except asyncio.QueueEmpty:
-            pass
-        
-        async with self._lock:
-            if self.created_connections < self.max_connections:
-                timeout = aiohttp.ClientTimeout(total=self.timeout)
-                session = aiohttp.ClientSession(timeout=timeout)
-                self.created_connections += 1
-                return session
-        
-        session = await self.pool.get()
-        return session
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_connections,
+                keepalive_timeout=60
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        
+        return self._session
     
     async def return_connection(self, session: aiohttp.ClientSession):
-        if not session.closed:
-            try:
-                self.pool.put_nowait(session)
-            except asyncio.QueueFull:
-                await session.close()
+        pass
     
     async def close_all(self):
-        while not self.pool.empty():
-            try:
-                session = self.pool.get_nowait()
-                await session.close()
-            except asyncio.QueueEmpty:
-                break
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
 
 class AsyncProducerConsumer:
-    def __init__(self, queue_size: int = 50):
+    def __init__(self, queue_size: int = 50, producer_batch_size: int = 1, queue_high_water: float = 0.8,
+                 max_drain: int = 10):
         self.queue = asyncio.Queue(maxsize=queue_size)
+        self.producer_batch_size = producer_batch_size
+        self.queue_high_water = queue_high_water
+        self.max_drain = max_drain
         self.producers: List[asyncio.Task] = []
         self.consumers: List[asyncio.Task] = []
         self.running = False
         self.metrics = {
             'produced': 0,
             'consumed': 0,
-            'errors': 0
+            'errors': 0,
+            'queue_fill': 0.0,
+            'high_water_hits': 0
         }
     
     async def start(self, num_producers: int = 2, num_consumers: int = 3):
@@ -215,11 +246,15 @@ class AsyncProducerConsumer:
     async def stop(self):
         self.running = False
         
-        all_tasks = self.producers + self.consumers
-        for task in all_tasks:
+        for task in self.producers:
             task.cancel()
         
-        await asyncio.gather(*all_tasks, return_exceptions=True)
+        await asyncio.gather(*self.producers, return_exceptions=True)
+        
+        for _ in self.consumers:
+            await self.queue.put(_SENTINEL)
+        
+        await asyncio.gather(*self.consumers, return_exceptions=True)
         
         logger.info("Producer-consumer system stopped")
         logger.info(f"Metrics: {self.metrics}")
@@ -227,43 +262,106 @@ class AsyncProducerConsumer:
     async def _producer(self, name: str):
         logger.info(f"{name} started")
         
-        while self.running:
-            try:
-                work_item = {
-                    'id': f"{name}-{self.metrics['produced']}",
-                    'data': random.randint(1, 100),
-                    'timestamp': time.time()
-                }
-                
-                await self.queue.put(work_item)
-                self.metrics['produced'] += 1
-                
-                logger.debug(f"{name} produced {work_item['id']}")
-                
-                await asyncio.sleep(random.uniform(0.5, 2.0))
-                
-            except Exception as e:
-                logger.error(f"{name} error: {e}")
-                self.metrics['errors'] += 1
+        sequence = itertools.count()
+        samples = self._random_samples()
+        batch = []
+        
+        try:
+            while self.running:
+                try:
+                    data, delay = next(samples)
+                    work_item = {
+                        'id': f"{name}-{next(sequence)}",
+                        'data': data,
+                        'timestamp': time.time()
+                    }
+                    batch.append(work_item)
+                    
+                    logger.debug(f"{name} produced {work_item['id']}")
+                    
+                    if len(batch) >= self.producer_batch_size:
+                        await self.queue.put(batch)
+                        self.metrics['produced'] += len(batch)
+                        batch = []
+                        self._record_queue_fill()
+                    
+                    await asyncio.sleep(delay)
+                    
+                except Exception as e:
+                    logger.error(f"{name} error: {e}")
+                    self.metrics['errors'] += 1
+        finally:
+            if batch:
+                try:
+                    self.queue.put_nowait(batch)
+                    self.metrics['produced'] += len(batch)
+                except asyncio.QueueFull:
+                    logger.warning(f"{name} dropped {len(batch)} unqueued items")
         
         logger.info(f"{name} stopped")
     
+    @staticmethod
+    def _random_samples(pool_size: int = 1024):
+        rng = np.random.default_rng()
+        while True:
+            data = rng.integers(1, 101, size=pool_size).tolist()
+            delays = rng.uniform(0.5, 2.0, size=pool_size).tolist()
+            yield from zip(data, delays)
+    
+    def _record_queue_fill(self):
+        if not self.queue.maxsize:
+            return
+        
+        fill = self.queue.qsize() / self.queue.maxsize
+        self.metrics['queue_fill'] = fill
+        if fill >= self.queue_high_water:
+            self.metrics['high_water_hits'] += 1
+            logger.debug(f"Queue above high water mark ({fill:.0%} full)")
+    
     async def _consumer(self, name: str):
         logger.info(f"{name} started")
         
-        while self.running:
+        while True:
             try:
-                work_item = await asyncio.wait_for(self.queue.get(), timeout=1.0)
+                batch = await self.queue.get()
+                if batch is _SENTINEL:
+                    self.queue.task_done()
+                    break
                 
-                await self._process_item(work_item)
+                batches = [batch]
+                stopping = False
+                while len(batches) <= self.max_drain:
+                    try:
+                        batch = self.queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        break
+                    if batch is _SENTINEL:
+                        stopping = True
+                        break
+                    batches.append(batch)
                 
-                self.metrics['consumed'] += 1
-                logger.debug(f"{name} consumed {work_item['id']}")
+                try:
+                    work_items = [work_item for batch in batches for work_item in batch]
+                    results = await asyncio.gather(
+                        *(self._process_item(work_item) for work_item in work_items),
+                        return_exceptions=True
+                    )
+                    
+                    for work_item, result in zip(work_items, results):
+                        if isinstance(result, Exception):
+                            logger.error(f"{name} error processing {work_item['id']}: {result}")
+                            self.metrics['errors'] += 1
+                        else:
+                            self.metrics['consumed'] += 1
+                    
+                    logger.debug(f"{name} consumed {len(work_items)} items")
                 
-                self.queue.task_done()
+                finally:
+                    for _ in range(len(batches) + stopping):
+                        self.queue.task_done()
                 
-            except asyncio.TimeoutError:
-                continue
+                if stopping:
+                    break
             
             except Exception as e:
                 logger.error(f"{name} error: {e}")
@@ -292,8 +390,7 @@ class ThreadSafeCounter:
     
     @property
     def value(self) -> int:
-        with self._lock:
-            return self._value
+        return self._value
     
     def reset(self) -> int:
         with self._lock:
@@ -302,8 +399,9 @@ class ThreadSafeCounter:
             return old_value
 
 class AsyncFileProcessor:
-    def __init__(self, max_concurrent_files: int = 5):
+    def __init__(self, max_concurrent_files: int = 5, simulate_latency: float = 0.0):
         self.semaphore = asyncio.Semaphore(max_concurrent_files)
+        self.simulate_latency = simulate_latency
         self.processed_count = 0
         self.error_count = 0
     
@@ -323,36 +421,55 @@ class AsyncFileProcessor:
             }
     
     async def _process_file(self, file_path: str) -> Dict[str, Any]:
-        async with self.semaphore:
-            try:
-                async with aiofiles.open(file_path, 'r') as file:
-                    content = await file.read()
-                    
-                    await asyncio.sleep(0.1)
-                    
-                    word_count = len(content.split())
-                    char_count = len(content)
-                    
-                    return {
-                        'file_path': file_path,
-                        'word_count': word_count,
-                        'char_count': char_count,
-                        'processed_at': datetime.now().isoformat()
-                    }
-                    
-            except Exception as e:
-                logger.error(f"Error processing {file_path}: {e}")
-                raise
+        try:
+            async with self.semaphore:
+                async with aiofiles.open(file_path, 'rb') as file:
+                    data = await file.read()
+                
+                if self.simulate_latency:
+                    await asyncio.sleep(self.simulate_latency)
+            
+            if data.isascii():
+                word_count = len(data.split())
+                char_count = len(data) - data.count(b'\r\n')
+            else:
+                content = data.decode()
+                word_count = len(content.split())
+                char_count = len(content) - content.count('\r\n')
+            
+            return {
+                'file_path': file_path,
+                'word_count': word_count,
+                'char_count': char_count,
+                'processed_at': datetime.now().isoformat()
+            }
+            
+        except Exception as e:
+            logger.error(f"Error processing {file_path}: {e}")
+            raise
 
 class MultiprocessingWorker:
     def __init__(self, max_workers: Optional[int] = None):
         self.max_workers = max_workers or multiprocessing.cpu_count()
+        self._executor: Optional[concurrent.futures.ProcessPoolExecutor] = None
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+    
+    async def aclose(self):
+        if self._executor is not None:
+            executor, self._executor = self._executor, None
+            await asyncio.to_thread(executor.shutdown)
     
     @staticmethod
-    def cpu_intensive_task(data: List[int]) -> Dict[str, Any]:
+    def cpu_intensive_task(data: np.ndarray) -> Dict[str, Any]:
         start_time = time.time()
         
-        result = sum(x * x for x in data for _ in range(1000))
+        arr = np.asarray(data, dtype=np.int64)
+        result = int(np.dot(arr, arr)) * 1000
         
         return {
             'result': result,
@@ -362,56 +479,65 @@ class MultiprocessingWorker:
         }
     
     async def process_data_chunks(self, data: List[int], chunk_size: int = 1000) -> List[Dict[str, Any]]:
-        chunks = [data[i:i + chunk_size] for i in range(0, len(data), chunk_size)]
+        arr = np.asarray(data, dtype=np.int64)
+        chunks = [arr[i:i + chunk_size] for i in range(0, arr.size, chunk_size)]
         
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
+        
+        if self._executor is None:
+            self._executor = concurrent.futures.ProcessPoolExecutor(max_workers=self.max_workers)
+        
+        futures = [
+            loop.run_in_executor(self._executor, self.cpu_intensive_task, chunk)
+            for chunk in chunks
+        ]
+        
+        results = await asyncio.gather(*futures)
         
-        with concurrent.futures.ProcessPoolExecutor(max_workers=self.max_workers) as executor:
-            futures = [
-                loop.run_in_executor(executor, self.cpu_intensive_task, chunk)
-                for chunk in chunks
-            ]
-            
-            results = await asyncio.gather(*futures)
-            
         logger.info(f"Processed {len(chunks)} chunks using {self.max_workers} processes")
         return results
 
 class AsyncBatchProcessor:
-    def __init__(self, batch_size: int = 10, max_retries: int = 3):
+    def __init__(self, batch_size: int = 10, max_retries: int = 3, max_concurrent_batches: int = 4):
         self.batch_size = batch_size
         self.max_retries = max_retries
+        self.max_concurrent_batches = max_concurrent_batches
         self.retry_delay = 1.0
     
     async def process_items(self, items: List[Any], processor_func: Callable) -> Dict[str, Any]:
         batches = [items[i:i + self.batch_size] for i in range(0, len(items), self.batch_size)]
+        semaphore = asyncio.Semaphore(self.max_concurrent_batches)
+        
+        async def run_batch(i: int, batch: List[Any]) -> Optional[List[Any]]:
+            async with semaphore:
+                logger.info(f"Processing batch {i + 1}/{len(batches)}")
+                
+                for attempt in range(self.max_retries + 1):
+                    try:
+                        return await self._process_batch(batch, processor_func)
+                        
+                    except Exception as e:
+                        if attempt < self.max_retries:
+                            wait_time = self.retry_delay * (2 ** attempt) * random.uniform(0.5, 1.5)
+                            logger.warning(f"Batch {i + 1} failed (attempt {attempt + 1}), retrying in {wait_time:.2f}s: {e}")
+                            await asyncio.sleep(wait_time)
+                        else:
+                            logger.error(f"Batch {i + 1} failed after {self.max_retries + 1} attempts: {e}")
+                
+                return None
+        
+        batch_results = await asyncio.gather(*(run_batch(i, batch) for i, batch in enumerate(batches)))
         
-        successful_batches = 0
-        failed_batches = 0
         all_results = []
+        for results in batch_results:
+            if results is not None:
+                all_results.extend(results)
         
-        for i, batch in enumerate(batches):
-            logger.info(f"Processing batch {i + 1}/{len(batches)}")
-            
-            for attempt in range(self.max_retries + 1):
-                try:
-                    batch_results = await self._process_batch(batch, processor_func)
-                    all_results.extend(batch_results)
-                    successful_batches += 1
-                    break
-                    
-                except Exception as e:
-                    if attempt < self.max_retries:
-                        wait_time = self.retry_delay * (2 ** attempt)
-                        logger.warning(f"Batch {i + 1} failed (attempt {attempt + 1}), retrying in {wait_time}s: {e}")
-                        await asyncio.sleep(wait_time)
-                    else:
-                        logger.error(f"Batch {i + 1} failed after {self.max_retries + 1} attempts: {e}")
-                        failed_batches += 1
+        failed_batches = batch_results.count(None)
         
         return {
             'total_batches': len(batches),
-            'successful_batches': successful_batches,
+            'successful_batches': len(batches) - failed_batches,
             'failed_batches': failed_batches,
             'results': all_results
         }
@@ -423,49 +549,64 @@ class AsyncBatchProcessor:
 
 class AsyncEventEmitter:
     def __init__(self):
-        self._listeners: Dict[str, List[Callable]] = {}
+        self._async_handlers: Dict[str, List[Callable[[], Optional[Callable]]]] = {}
+        self._sync_handlers: Dict[str, List[Callable[[], Optional[Callable]]]] = {}
         self._max_listeners = 10
     
     def on(self, event: str, handler: Callable):
-        if event not in self._listeners:
-            self._listeners[event] = []
+        async_handlers = self._async_handlers.setdefault(event, [])
+        sync_handlers = self._sync_handlers.setdefault(event, [])
         
-        if len(self._listeners[event]) >= self._max_listeners:
+        if len(async_handlers) + len(sync_handlers) >= self._max_listeners:
             logger.warning(f"Maximum listeners ({self._max_listeners}) reached for event '{event}'")
         
-        self._listeners[event].append(handler)
+        if asyncio.iscoroutinefunction(handler):
+            async_handlers.append(_handler_ref(handler))
+        else:
+            sync_handlers.append(_handler_ref(handler))
     
     def off(self, event: str, handler: Callable):
-        if event in self._listeners:
-            try:
-                self._listeners[event].remove(handler)
-            except ValueError:
-                pass
+        for listeners in (self._async_handlers.get(event, []), self._sync_handlers.get(event, [])):
+            for i, ref in enumerate(listeners):
+                if ref() == handler:
+                    del listeners[i]
+                    return
+    
+    @staticmethod
+    def _live_handlers(listeners: List[Callable[[], Optional[Callable]]]) -> List[Callable]:
+        handlers = [ref() for ref in listeners]
+        if any(handler is None for handler in handlers):
+            listeners[:] = [ref for ref, handler in zip(listeners, handlers) if handler is not None]
+            handlers = [handler for handler in handlers if handler is not None]
+        return handlers
     
     async def emit(self, event: str, *args, **kwargs):
-        if event not in self._listeners:
+        if event not in self._async_handlers:
             return
         
-        handlers = self._listeners[event].copy()
-        tasks = []
+        for handler in self._live_handlers(self._sync_handlers[event]):
+            try:
+                handler(*args, **kwargs)
+            except Exception as e:
+                logger.error(f"Event handler {handler} raised exception: {e}")
+        
+        handlers = self._live_handlers(self._async_handlers[event])
+        if not handlers:
+            return
         
+        started = []
         for handler in handlers:
             try:
-                if asyncio.iscoroutinefunction(handler):
-                    tasks.append(handler(*args, **kwargs))
-                else:
-                    loop = asyncio.get_event_loop()
-                    task = loop.run_in_executor(None, functools.partial(handler, *args, **kwargs))
-                    tasks.append(task)
+                started.append((handler, handler(*args, **kwargs)))
             except Exception as e:
                 logger.error(f"Error creating task for handler {handler}: {e}")
         
-        if tasks:
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+        if started:
+            results = await asyncio.gather(*(coro for _, coro in started), return_exceptions=True)
             
-            for i, result in enumerate(results):
+            for (handler, _), result in zip(started, results):
                 if isinstance(result, Exception):
-                    logger.error(f"Event handler {handlers[i]} raised exception: {result}")
+                    logger.error(f"Event handler {handler} raised exception: {result}")
 
 async def demonstrate_async_patterns():
     print("=== Async/Concurrency Patterns Demo ===")
@@ -487,6 +628,15 @@ async def demonstrate_async_patterns():
         result = await task_queue.get_result(task_id)
         print(f"Task {task_id} result: {result}")
     
+    cancelled_submit = asyncio.create_task(task_queue.submit_task(sample_task, 5))
+    await asyncio.sleep(0)
+    cancelled_submit.cancel()
+    await asyncio.gather(cancelled_submit, return_exceptions=True)
+    
+    task_id = await task_queue.submit_task(sample_task, 6)
+    result = await task_queue.get_result(task_id)
+    print(f"Task {task_id} result after a cancelled submit: {result}")
+    
     await task_queue.stop_workers()
     
     print("\n2. Testing Producer-Consumer Pattern...")
@@ -520,11 +670,10 @@ async def demonstrate_async_patterns():
     os.rmdir(temp_dir)
     
     print("\n4. Testing Multiprocessing for CPU-bound work...")
-    mp_worker = MultiprocessingWorker(max_workers=2)
-    
     sample_data = list(range(10000))
     
-    results = await mp_worker.process_data_chunks(sample_data, chunk_size=2500)
+    async with MultiprocessingWorker(max_workers=2) as mp_worker:
+        results = await mp_worker.process_data_chunks(sample_data, chunk_size=2500)
     
     total_time = sum(r['computation_time'] for r in results)
     print(f"Processed {len(sample_data)} numbers in {total_time:.4f}s using multiprocessing")
@@ -582,5 +731,11 @@ async def benchmark_async_vs_sync():
     print(f"Async speedup: ~{len(test_urls) / async_time:.2f}x faster")
 
 if __name__ == "__main__":
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        logger.info("uvloop is not installed; using the default asyncio event loop")
+    
     asyncio.run(demonstrate_async_patterns())
     asyncio.run(benchmark_async_vs_sync()) 
\ No newline at end of file
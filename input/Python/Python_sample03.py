@@ -1,11 +1,22 @@
 #!/usr/bin/env python3
 
 import asyncio
+import base64
 import hashlib
+import hmac
+import importlib.util
 import logging
+import os
+import re
+import socket
 import time
-from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Union
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Union
+from urllib.parse import urlencode
 import uuid
 
 from fastapi import (
@@ -16,42 +27,92 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.responses import JSONResponse
-import jwt
+from starlette.datastructures import MutableHeaders
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHash, VerificationError
+import msgpack
+import orjson
 from passlib.context import CryptContext
-from pydantic import BaseModel, EmailStr, Field, validator
-import redis
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, create_engine
+from pydantic import BaseModel, ConfigDict, Field, validator
+from redis import asyncio as aioredis
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, Index, case, delete, func, select, text, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
 import uvicorn
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+SLIDING_WINDOW_SCRIPT = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+
+redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window)
+local count = redis.call('ZCARD', key)
+local allowed = 0
+if count < limit then
+    redis.call('ZADD', key, now, ARGV[4])
+    count = count + 1
+    allowed = 1
+end
+redis.call('PEXPIRE', key, window)
+
+local reset = now + window
+local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+if oldest[2] then
+    reset = tonumber(oldest[2]) + window
+end
+return {allowed, limit - count, reset}
+"""
+
+EMAIL_PATTERN = r"^[^@\s]+@[^@\s]+\.[^@\s]+$"
+PASSWORD_DIGIT_RE = re.compile(r"\d")
+PASSWORD_UPPER_RE = re.compile(r"[A-Z]")
+
+UPSERT_INSERTS = {
+    "postgresql": pg_insert,
+    "sqlite": sqlite_insert,
+}
+
+TASK_ANALYTICS_SQL = text("""
+SELECT GROUPING(category) AS category_level,
+       GROUPING(priority) AS priority_level,
+       category,
+       priority,
+       COUNT(*) AS count,
+       SUM(CASE WHEN completed THEN 1 ELSE 0 END) AS completed
+FROM tasks
+WHERE user_id = :user_id
+GROUP BY GROUPING SETS ((), (category), (priority))
+""")
+
 class UserCreate(BaseModel):
     username: str = Field(..., min_length=3, max_length=50)
-    email: EmailStr
+    email: str = Field(..., max_length=100, pattern=EMAIL_PATTERN)
     password: str = Field(..., min_length=8)
     full_name: Optional[str] = Field(None, max_length=100)
     
     @validator('password')
     def validate_password(cls, v):
-        if not any(char.isdigit() for char in v):
+        if not PASSWORD_DIGIT_RE.search(v):
             raise ValueError('Password must contain at least one digit')
-        if not any(char.isupper() for char in v):
+        if not PASSWORD_UPPER_RE.search(v):
             raise ValueError('Password must contain at least one uppercase letter')
         return v
 
 class UserResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    
     id: int
     username: str
     email: str
     full_name: Optional[str]
     is_active: bool
     created_at: datetime
-    
-    class Config:
-        from_attributes = True
 
 class UserLogin(BaseModel):
     username: str
@@ -69,6 +130,8 @@ class TaskCreate(BaseModel):
     category: Optional[str] = Field(None, max_length=50)
 
 class TaskResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    
     id: int
     title: str
     description: Optional[str]
@@ -79,8 +142,9 @@ class TaskResponse(BaseModel):
     updated_at: Optional[datetime]
     user_id: int
     
-    class Config:
-        from_attributes = True
+    @classmethod
+    def dump_row(cls, row: Any) -> Dict[str, Any]:
+        return {field: getattr(row, field) for field in cls.model_fields}
 
 class TaskUpdate(BaseModel):
     title: Optional[str] = Field(None, min_length=1, max_length=200)
@@ -98,7 +162,7 @@ class User(Base):
     username = Column(String(50), unique=True, index=True, nullable=False)
     email = Column(String(100), unique=True, index=True, nullable=False)
     full_name = Column(String(100))
-    hashed_password = Column(String(128), nullable=False)
+    hashed_password = Column(String(255), nullable=False)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
@@ -113,79 +177,163 @@ class Task(Base):
     completed = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    user_id = Column(Integer, nullable=False, index=True)
+    user_id = Column(Integer, nullable=False)
+    
+    __table_args__ = (
+        Index("ix_tasks_user_completed", "user_id", "completed"),
+        Index("ix_tasks_user_category", "user_id", "category", postgresql_include=["completed"]),
+        Index("ix_tasks_user_priority", "user_id", "priority"),
+        Index("ix_tasks_user_created", "user_id", "created_at", "id"),
+    )
+
+@dataclass
+class CurrentUser:
+    id: int
+    username: str
+    email: str
+    full_name: Optional[str]
+    is_active: bool
+    created_at: datetime
+
+def _b64encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+def _b64decode(data: bytes) -> bytes:
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
 
 class AuthService:
     def __init__(self):
-        self.secret_key = "your-secret-key-change-in-production"
+        self.secret_key = os.environ.get("JWT_SECRET_KEY", "your-secret-key-change-in-production")
         self.algorithm = "HS256"
         self.access_token_expire_minutes = 30
-        self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+        self._hmac = hmac.new(self.secret_key.encode(), digestmod=hashlib.sha256)
+        self._token_header = _b64encode(orjson.dumps({"alg": self.algorithm, "typ": "JWT"}))
+        self.password_hasher = PasswordHasher(time_cost=2, memory_cost=64 * 1024, parallelism=1, hash_len=32)
+        self.legacy_pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
     
     def hash_password(self, password: str) -> str:
-        return self.pwd_context.hash(password)
+        return self.password_hasher.hash(password)
     
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        return self.pwd_context.verify(plain_password, hashed_password)
+        if not hashed_password.startswith("$argon2"):
+            return self.legacy_pwd_context.verify(plain_password, hashed_password)
+        
+        try:
+            return self.password_hasher.verify(hashed_password, plain_password)
+        except (VerificationError, InvalidHash):
+            return False
+    
+    def _sign(self, signing_input: bytes) -> bytes:
+        mac = self._hmac.copy()
+        mac.update(signing_input)
+        return mac.digest()
     
     def create_access_token(self, data: Dict[str, Any]) -> str:
         to_encode = data.copy()
-        expire = datetime.utcnow() + timedelta(minutes=self.access_token_expire_minutes)
-        to_encode.update({"exp": expire})
+        to_encode.update({"exp": int(time.time()) + self.access_token_expire_minutes * 60})
         
-        encoded_jwt = jwt.encode(to_encode, self.secret_key, algorithm=self.algorithm)
-        return encoded_jwt
+        signing_input = self._token_header + b"." + _b64encode(orjson.dumps(to_encode))
+        return (signing_input + b"." + _b64encode(self._sign(signing_input))).decode()
     
     def decode_access_token(self, token: str) -> Dict[str, Any]:
         try:
-            payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+            signing_input, _, signature = token.encode().rpartition(b".")
+            header_segment, _, payload_segment = signing_input.partition(b".")
+            header = orjson.loads(_b64decode(header_segment))
+            if header.get("alg") != self.algorithm or not hmac.compare_digest(
+                self._sign(signing_input), _b64decode(signature)
+            ):
+                raise ValueError("Signature verification failed")
+            
+            payload = orjson.loads(_b64decode(payload_segment))
+            if payload["exp"] < time.time():
+                raise ValueError("Signature has expired")
             return payload
-        except jwt.PyJWTError:
+        except (ValueError, KeyError, TypeError, AttributeError):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid authentication credentials"
             )
 
 class DatabaseService:
-    def __init__(self, database_url: str = "sqlite:///./test.db"):
-        self.engine = create_engine(database_url, connect_args={"check_same_thread": False})
-        self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+    def __init__(self, database_url: str = "sqlite+aiosqlite:///./test.db", pool_size: int = 5, max_overflow: int = 5):
+        if database_url.startswith("sqlite"):
+            self.engine = create_async_engine(database_url)
+        else:
+            self.engine = create_async_engine(
+                database_url,
+                pool_size=pool_size,
+                max_overflow=max_overflow,
+                pool_timeout=30,
+                pool_recycle=3600,
+                pool_pre_ping=True
+            )
+        self.SessionLocal = async_sessionmaker(bind=self.engine, autoflush=False, expire_on_commit=False)
+    
+    async def create_tables(self) -> None:
+        async with self.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    
+    async def warm_pool(self, connections: int) -> None:
+        async def checkout() -> None:
+            async with self.engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
         
-        Base.metadata.create_all(bind=self.engine)
+        await asyncio.gather(*(checkout() for _ in range(connections)))
     
-    def get_db(self) -> Session:
-        db = self.SessionLocal()
-        try:
+    async def get_db(self) -> AsyncIterator[AsyncSession]:
+        async with self.SessionLocal() as db:
             yield db
-        finally:
-            db.close()
 
 class CacheService:
     def __init__(self, redis_url: str = "redis://localhost:6379"):
+        self.redis_client = aioredis.from_url(redis_url)
+    
+    async def connect(self, warm_connections: int = 4) -> None:
         try:
-            self.redis_client = redis.from_url(redis_url, decode_responses=True)
-            self.redis_client.ping()
+            await asyncio.gather(*(self.redis_client.ping() for _ in range(warm_connections)))
             logger.info("Connected to Redis")
         except Exception as e:
             logger.warning(f"Redis connection failed: {e}")
+            await self.redis_client.aclose()
             self.redis_client = None
     
-    async def get(self, key: str) -> Optional[str]:
+    def pipeline(self):
+        if not self.redis_client:
+            return None
+        
+        return self.redis_client.pipeline(transaction=False)
+    
+    async def get(self, key: str) -> Optional[bytes]:
         if not self.redis_client:
             return None
         
         try:
-            return self.redis_client.get(key)
+            return await self.redis_client.get(key)
         except Exception as e:
             logger.error(f"Cache get error: {e}")
             return None
     
-    async def set(self, key: str, value: str, expire: int = 300) -> bool:
+    async def set(self, key: str, value: Union[str, bytes], expire: int = 300) -> bool:
+        if not self.redis_client:
+            return False
+        
+        try:
+            return await self.redis_client.setex(key, expire, value)
+        except Exception as e:
+            logger.error(f"Cache set error: {e}")
+            return False
+    
+    async def mset_many(self, items: Dict[str, str], expire: int = 300) -> bool:
         if not self.redis_client:
             return False
         
         try:
-            return self.redis_client.setex(key, expire, value)
+            async with self.pipeline() as pipe:
+                for key, value in items.items():
+                    pipe.setex(key, expire, value)
+                await pipe.execute()
+            return True
         except Exception as e:
             logger.error(f"Cache set error: {e}")
             return False
@@ -195,20 +343,115 @@ class CacheService:
             return False
         
         try:
-            return bool(self.redis_client.delete(key))
+            return bool(await self.redis_client.delete(key))
+        except Exception as e:
+            logger.error(f"Cache delete error: {e}")
+            return False
+    
+    async def set_indexed(self, key: str, value: Union[str, bytes], index_key: str, expire: int = 300) -> bool:
+        if not self.redis_client:
+            return False
+        
+        try:
+            async with self.pipeline() as pipe:
+                pipe.setex(key, expire, value)
+                pipe.sadd(index_key, key)
+                pipe.expire(index_key, expire)
+                await pipe.execute()
+            return True
+        except Exception as e:
+            logger.error(f"Cache set error: {e}")
+            return False
+    
+    async def invalidate_index(self, index_key: str) -> bool:
+        if not self.redis_client:
+            return False
+        
+        try:
+            keys = await self.redis_client.smembers(index_key)
+            async with self.pipeline() as pipe:
+                if keys:
+                    pipe.unlink(*keys)
+                pipe.delete(index_key)
+                await pipe.execute()
+            return True
         except Exception as e:
             logger.error(f"Cache delete error: {e}")
             return False
 
 class BackgroundTaskService:
-    def __init__(self):
+    def __init__(self, cache: CacheService, email_stream: str = "emails", email_group: str = "emailers",
+                 email_stream_maxlen: int = 100000):
         self.task_queue: List[Dict[str, Any]] = []
+        self.cache = cache
+        self.email_stream = email_stream
+        self.email_group = email_group
+        self.email_stream_maxlen = email_stream_maxlen
     
     async def send_email(self, email: str, subject: str, message: str) -> None:
         logger.info(f"Sending email to {email}: {subject}")
         await asyncio.sleep(2)
         logger.info(f"Email sent successfully to {email}")
     
+    async def enqueue_email(self, email: str, subject: str, message: str) -> bool:
+        if not self.cache.redis_client:
+            return False
+        
+        try:
+            await self.cache.redis_client.xadd(
+                self.email_stream,
+                {"to": email, "subj": subject, "body": message},
+                maxlen=self.email_stream_maxlen,
+                approximate=True
+            )
+            return True
+        except Exception as e:
+            logger.error(f"Email enqueue error: {e}")
+            return False
+    
+    async def run_email_worker(self, consumer: str = "c1", batch_size: int = 100, block_ms: int = 1000,
+                               max_backoff: float = 30.0) -> None:
+        redis_client = self.cache.redis_client
+        if not redis_client:
+            logger.warning("Redis unavailable, email worker not started")
+            return
+        
+        group_ready = False
+        backoff = 0.0
+        while True:
+            try:
+                if not group_ready:
+                    try:
+                        await redis_client.xgroup_create(self.email_stream, self.email_group, id="0", mkstream=True)
+                    except aioredis.ResponseError as e:
+                        if "BUSYGROUP" not in str(e):
+                            raise
+                    group_ready = True
+                
+                batches = await redis_client.xreadgroup(
+                    self.email_group, consumer, {self.email_stream: ">"}, count=batch_size, block=block_ms
+                )
+                for _, messages in batches:
+                    results = await asyncio.gather(*(
+                        self.send_email(fields[b"to"].decode(), fields[b"subj"].decode(), fields[b"body"].decode())
+                        for _, fields in messages
+                    ), return_exceptions=True)
+                    
+                    delivered = []
+                    for (message_id, _), result in zip(messages, results):
+                        if isinstance(result, Exception):
+                            logger.error(f"Email delivery error for {message_id!r}: {result}")
+                        else:
+                            delivered.append(message_id)
+                    
+                    if delivered:
+                        await redis_client.xack(self.email_stream, self.email_group, *delivered)
+                backoff = 0.0
+            except Exception as e:
+                backoff = min(max(backoff * 2, 0.5), max_backoff)
+                logger.error(f"Email worker error, retrying in {backoff:.1f}s: {e}")
+                await asyncio.sleep(backoff)
+    
     async def process_data(self, data: Dict[str, Any]) -> None:
         logger.info(f"Processing data: {data}")
         await asyncio.sleep(5)
@@ -220,50 +463,127 @@ class BackgroundTaskService:
         logger.info("Cleanup completed")
 
 class RateLimitMiddleware:
-    def __init__(self, app, max_requests: int = 100, window_seconds: int = 60):
+    def __init__(self, app, max_requests: int = 100, window_seconds: int = 60,
+                 redis_url: str = "redis://localhost:6379", redis_retry_seconds: float = 5.0):
         self.app = app
         self.max_requests = max_requests
         self.window_seconds = window_seconds
-        self.requests: Dict[str, List[float]] = {}
+        self.redis_retry_seconds = redis_retry_seconds
+        self.requests: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=self.max_requests))
+        self.redis_client = aioredis.from_url(redis_url)
+        self._sliding_window = self.redis_client.register_script(SLIDING_WINDOW_SCRIPT)
+        self._redis_retry_at = 0.0
+        self._eviction_task: Optional[asyncio.Task] = None
     
     async def __call__(self, scope, receive, send):
         if scope["type"] == "http":
             request = Request(scope, receive)
-            client_ip = request.client.host
+            client_ip = request.client.host if request.client else "unknown"
             
-            current_time = time.time()
+            allowed, remaining, reset = await self._check_limit(client_ip)
+            limit_headers = {
+                "X-RateLimit-Limit": str(self.max_requests),
+                "X-RateLimit-Remaining": str(max(remaining, 0)),
+                "X-RateLimit-Reset": str(int(reset) + 1)
+            }
             
-            if client_ip in self.requests:
-                self.requests[client_ip] = [
-                    req_time for req_time in self.requests[client_ip]
-                    if current_time - req_time < self.window_seconds
-                ]
-            else:
-                self.requests[client_ip] = []
-            
-            if len(self.requests[client_ip]) >= self.max_requests:
+            if not allowed:
                 response = JSONResponse(
                     status_code=429,
-                    content={"detail": "Rate limit exceeded"}
+                    content={"detail": "Rate limit exceeded"},
+                    headers=limit_headers
                 )
                 await response(scope, receive, send)
                 return
             
-            self.requests[client_ip].append(current_time)
+            async def send_with_limit_headers(message):
+                if message["type"] == "http.response.start":
+                    MutableHeaders(scope=message).update(limit_headers)
+                await send(message)
+            
+            await self.app(scope, receive, send_with_limit_headers)
+            return
         
         await self.app(scope, receive, send)
+    
+    async def _check_limit(self, client_ip: str):
+        current_time = time.time()
+        
+        if time.monotonic() >= self._redis_retry_at:
+            now_ms = int(current_time * 1000)
+            try:
+                allowed, remaining, reset_ms = await self._sliding_window(
+                    keys=[f"rate_limit:{client_ip}"],
+                    args=[now_ms, self.window_seconds * 1000, self.max_requests, f"{now_ms}-{uuid.uuid4().hex}"]
+                )
+                return bool(allowed), int(remaining), int(reset_ms) / 1000
+            except Exception as e:
+                logger.warning(
+                    f"Redis rate limiting failed, using local limits for {self.redis_retry_seconds}s: {e}"
+                )
+                self._redis_retry_at = time.monotonic() + self.redis_retry_seconds
+        
+        if self._eviction_task is None:
+            self._eviction_task = asyncio.create_task(self._evict_idle_clients())
+        
+        timestamps = self.requests[client_ip]
+        while timestamps and current_time - timestamps[0] >= self.window_seconds:
+            timestamps.popleft()
+        
+        allowed = len(timestamps) < self.max_requests
+        if allowed:
+            timestamps.append(current_time)
+        
+        reset = (timestamps[0] if timestamps else current_time) + self.window_seconds
+        return allowed, self.max_requests - len(timestamps), reset
+    
+    async def _evict_idle_clients(self) -> None:
+        while True:
+            await asyncio.sleep(self.window_seconds)
+            cutoff = time.time() - self.window_seconds
+            for client_ip in [ip for ip, timestamps in self.requests.items() if not timestamps or timestamps[-1] <= cutoff]:
+                del self.requests[client_ip]
 
 auth_service = AuthService()
-db_service = DatabaseService()
+db_service = DatabaseService(
+    os.environ.get("DATABASE_URL", "sqlite+aiosqlite:///./test.db"),
+    pool_size=int(os.environ.get("DB_POOL_SIZE", "5")),
+    max_overflow=int(os.environ.get("DB_MAX_OVERFLOW", "5"))
+)
 cache_service = CacheService()
-task_service = BackgroundTaskService()
+task_service = BackgroundTaskService(cache_service)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    logger.info("FastAPI microservice starting up...")
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=os.cpu_count()))
+    await db_service.create_tables()
+    await asyncio.gather(
+        db_service.warm_pool(min(int(os.environ.get("DB_POOL_WARM", "0")), db_service.engine.pool.size())),
+        cache_service.connect()
+    )
+    email_worker = asyncio.create_task(
+        task_service.run_email_worker(consumer=f"{socket.gethostname()}-{os.getpid()}")
+    )
+    logger.info("All services initialized successfully")
+    
+    yield
+    
+    logger.info("FastAPI microservice shutting down...")
+    email_worker.cancel()
+    await asyncio.gather(email_worker, return_exceptions=True)
+    if cache_service.redis_client:
+        await cache_service.redis_client.aclose()
+    await db_service.engine.dispose()
+    logger.info("Cleanup completed")
 
 app = FastAPI(
     title="Advanced Task Management API",
     description="A comprehensive FastAPI microservice with authentication and advanced features",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -283,8 +603,8 @@ security = HTTPBearer()
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Security(security),
-    db: Session = Depends(db_service.get_db)
-) -> User:
+    db: AsyncSession = Depends(db_service.get_db)
+) -> CurrentUser:
     token = credentials.credentials
     payload = auth_service.decode_access_token(token)
     username = payload.get("sub")
@@ -295,14 +615,51 @@ async def get_current_user(
             detail="Invalid authentication credentials"
         )
     
-    user = db.query(User).filter(User.username == username).first()
+    cache_key = f"auth:{username}"
+    cached_user = await cache_service.get(cache_key)
+    
+    if cached_user:
+        fields = msgpack.unpackb(cached_user)
+        fields["created_at"] = datetime.fromisoformat(fields["created_at"])
+        return CurrentUser(**fields)
+    
+    user = await db.scalar(select(User).where(User.username == username))
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found"
         )
     
-    return user
+    current_user = CurrentUser(
+        id=user.id,
+        username=user.username,
+        email=user.email,
+        full_name=user.full_name,
+        is_active=user.is_active,
+        created_at=user.created_at
+    )
+    await cache_service.set(
+        cache_key,
+        msgpack.packb(asdict(current_user), default=datetime.isoformat),
+        expire=auth_service.access_token_expire_minutes * 60
+    )
+    
+    return current_user
+
+def body_etag(body: bytes) -> str:
+    return f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+
+def conditional_json_response(request: Request, body: bytes, etag: str,
+                              headers: Optional[Dict[str, str]] = None) -> Response:
+    response_headers = {"ETag": etag, "Cache-Control": "private, max-age=30", **(headers or {})}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (
+        if_none_match.strip() == "*"
+        or etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    ):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=response_headers)
+    
+    return Response(content=body, media_type="application/json", headers=response_headers)
 
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
@@ -346,47 +703,45 @@ async def detailed_health_check():
 async def register_user(
     user_data: UserCreate,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(db_service.get_db)
+    db: AsyncSession = Depends(db_service.get_db)
 ):
-    existing_user = db.query(User).filter(
-        (User.username == user_data.username) | (User.email == user_data.email)
-    ).first()
+    insert_factory = UPSERT_INSERTS[db.bind.dialect.name]
+    hashed_password = await asyncio.to_thread(auth_service.hash_password, user_data.password)
+    db_user = await db.scalar(
+        insert_factory(User)
+        .values(
+            username=user_data.username,
+            email=user_data.email,
+            full_name=user_data.full_name,
+            hashed_password=hashed_password
+        )
+        .on_conflict_do_nothing()
+        .returning(User)
+    )
+    await db.commit()
     
-    if existing_user:
+    if not db_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username or email already registered"
         )
     
-    hashed_password = auth_service.hash_password(user_data.password)
-    db_user = User(
-        username=user_data.username,
-        email=user_data.email,
-        full_name=user_data.full_name,
-        hashed_password=hashed_password
-    )
-    
-    db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
-    
-    background_tasks.add_task(
-        task_service.send_email,
-        user_data.email,
-        "Welcome!",
-        "Thank you for registering with our service."
-    )
+    welcome_email = (user_data.email, "Welcome!", "Thank you for registering with our service.")
+    if not await task_service.enqueue_email(*welcome_email):
+        background_tasks.add_task(task_service.send_email, *welcome_email)
     
     return db_user
 
 @app.post("/auth/login", response_model=Token)
 async def login_user(
     user_data: UserLogin,
-    db: Session = Depends(db_service.get_db)
+    db: AsyncSession = Depends(db_service.get_db)
 ):
-    user = db.query(User).filter(User.username == user_data.username).first()
+    user = await db.scalar(select(User).where(User.username == user_data.username))
     
-    if not user or not auth_service.verify_password(user_data.password, user.hashed_password):
+    if not user or not await asyncio.to_thread(
+        auth_service.verify_password, user_data.password, user.hashed_password
+    ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password"
@@ -407,14 +762,14 @@ async def login_user(
     }
 
 @app.get("/auth/me", response_model=UserResponse)
-async def get_current_user_info(current_user: User = Depends(get_current_user)):
+async def get_current_user_info(current_user: CurrentUser = Depends(get_current_user)):
     return current_user
 
 @app.post("/tasks", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
 async def create_task(
     task_data: TaskCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(db_service.get_db)
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(db_service.get_db)
 ):
     db_task = Task(
         title=task_data.title,
@@ -425,56 +780,87 @@ async def create_task(
     )
     
     db.add(db_task)
-    db.commit()
-    db.refresh(db_task)
+    await db.commit()
+    await db.refresh(db_task)
     
-    cache_key = f"user_tasks:{current_user.id}"
-    await cache_service.delete(cache_key)
+    await cache_service.invalidate_index(f"user_tasks_index:{current_user.id}")
     
     return db_task
 
 @app.get("/tasks", response_model=List[TaskResponse])
 async def get_tasks(
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
     category: Optional[str] = Query(None),
     completed: Optional[bool] = Query(None),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(db_service.get_db)
+    after_created: Optional[datetime] = Query(None),
+    after_id: Optional[int] = Query(None, gt=0),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(db_service.get_db)
 ):
-    cache_key = f"user_tasks:{current_user.id}:{skip}:{limit}:{category}:{completed}"
+    if (after_created is None) != (after_id is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="after_created and after_id must be provided together"
+        )
+    
+    cache_key = f"user_tasks:{current_user.id}:{skip}:{limit}:{category}:{completed}:{after_created}:{after_id}"
     cached_result = await cache_service.get(cache_key)
     
     if cached_result:
-        import json
-        return json.loads(cached_result)
+        cached_page = msgpack.unpackb(cached_result)
+        return conditional_json_response(
+            request, cached_page["body"], cached_page["etag"],
+            {"X-Next-Cursor": cached_page["cursor"]} if cached_page["cursor"] else None
+        )
     
-    query = db.query(Task).filter(Task.user_id == current_user.id)
+    query = select(Task).where(Task.user_id == current_user.id)
     
     if category:
-        query = query.filter(Task.category == category)
+        query = query.where(Task.category == category)
     
     if completed is not None:
-        query = query.filter(Task.completed == completed)
+        query = query.where(Task.completed == completed)
     
-    tasks = query.offset(skip).limit(limit).all()
+    if after_id is not None:
+        query = query.where(tuple_(Task.created_at, Task.id) < (after_created, after_id))
     
-    import json
-    tasks_json = json.dumps([task.__dict__ for task in tasks], default=str)
-    await cache_service.set(cache_key, tasks_json, expire=300)
+    if skip:
+        query = query.offset(skip)
+    
+    query = query.order_by(Task.created_at.desc(), Task.id.desc()).limit(limit)
+    tasks = (await db.scalars(query)).all()
+    
+    next_cursor = ""
+    if len(tasks) == limit:
+        next_cursor = urlencode({"after_created": tasks[-1].created_at.isoformat(), "after_id": tasks[-1].id})
+    
+    tasks_json = orjson.dumps([TaskResponse.dump_row(task) for task in tasks])
+    etag = body_etag(tasks_json)
+    await cache_service.set_indexed(
+        cache_key,
+        msgpack.packb({"cursor": next_cursor, "body": tasks_json, "etag": etag}),
+        f"user_tasks_index:{current_user.id}",
+        expire=300
+    )
     
-    return tasks
+    return conditional_json_response(
+        request, tasks_json, etag,
+        {"X-Next-Cursor": next_cursor} if next_cursor else None
+    )
 
 @app.get("/tasks/{task_id}", response_model=TaskResponse)
 async def get_task(
+    request: Request,
     task_id: int = Path(..., gt=0),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(db_service.get_db)
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(db_service.get_db)
 ):
-    task = db.query(Task).filter(
+    task = await db.scalar(select(Task).where(
         Task.id == task_id,
         Task.user_id == current_user.id
-    ).first()
+    ))
     
     if not task:
         raise HTTPException(
@@ -482,19 +868,23 @@ async def get_task(
             detail="Task not found"
         )
     
-    return task
+    task_json = orjson.dumps(TaskResponse.dump_row(task))
+    return conditional_json_response(request, task_json, body_etag(task_json))
 
 @app.put("/tasks/{task_id}", response_model=TaskResponse)
 async def update_task(
     task_update: TaskUpdate,
     task_id: int = Path(..., gt=0),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(db_service.get_db)
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(db_service.get_db)
 ):
-    task = db.query(Task).filter(
-        Task.id == task_id,
-        Task.user_id == current_user.id
-    ).first()
+    update_data = task_update.dict(exclude_unset=True)
+    task = await db.scalar(
+        update(Task)
+        .where(Task.id == task_id, Task.user_id == current_user.id)
+        .values(**update_data, updated_at=datetime.utcnow())
+        .returning(Task)
+    )
     
     if not task:
         raise HTTPException(
@@ -502,64 +892,67 @@ async def update_task(
             detail="Task not found"
         )
     
-    update_data = task_update.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(task, field, value)
-    
-    task.updated_at = datetime.utcnow()
+    await db.commit()
     
-    db.commit()
-    db.refresh(task)
-    
-    cache_key = f"user_tasks:{current_user.id}"
-    await cache_service.delete(cache_key)
+    await cache_service.invalidate_index(f"user_tasks_index:{current_user.id}")
     
     return task
 
 @app.delete("/tasks/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_task(
     task_id: int = Path(..., gt=0),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(db_service.get_db)
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(db_service.get_db)
 ):
-    task = db.query(Task).filter(
-        Task.id == task_id,
-        Task.user_id == current_user.id
-    ).first()
+    deleted_id = await db.scalar(
+        delete(Task)
+        .where(Task.id == task_id, Task.user_id == current_user.id)
+        .returning(Task.id)
+    )
     
-    if not task:
+    if not deleted_id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Task not found"
         )
     
-    db.delete(task)
-    db.commit()
+    await db.commit()
     
-    cache_key = f"user_tasks:{current_user.id}"
-    await cache_service.delete(cache_key)
+    await cache_service.invalidate_index(f"user_tasks_index:{current_user.id}")
 
 @app.get("/analytics/tasks")
 async def get_task_analytics(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(db_service.get_db)
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(db_service.get_db)
 ):
-    total_tasks = db.query(Task).filter(Task.user_id == current_user.id).count()
-    completed_tasks = db.query(Task).filter(
-        Task.user_id == current_user.id,
-        Task.completed == True
-    ).count()
-    
-    from sqlalchemy import func
-    category_stats = db.query(
-        Task.category,
-        func.count(Task.id).label('count')
-    ).filter(Task.user_id == current_user.id).group_by(Task.category).all()
-    
-    priority_stats = db.query(
-        Task.priority,
-        func.count(Task.id).label('count')
-    ).filter(Task.user_id == current_user.id).group_by(Task.priority).all()
+    if db.bind.dialect.name == "postgresql":
+        rows = (await db.execute(TASK_ANALYTICS_SQL, {"user_id": current_user.id})).all()
+        
+        total_tasks = completed_tasks = 0
+        category_stats = []
+        priority_stats = []
+        for category_level, priority_level, category, priority, count, completed in rows:
+            if category_level and priority_level:
+                total_tasks, completed_tasks = count, completed or 0
+            elif priority_level:
+                category_stats.append((category, count))
+            else:
+                priority_stats.append((priority, count))
+    else:
+        category_rows = (await db.execute(select(
+            Task.category,
+            func.count(Task.id).label('count'),
+            func.sum(case((Task.completed == True, 1), else_=0)).label('completed')
+        ).where(Task.user_id == current_user.id).group_by(Task.category))).all()
+        
+        priority_stats = (await db.execute(select(
+            Task.priority,
+            func.count(Task.id).label('count')
+        ).where(Task.user_id == current_user.id).group_by(Task.priority))).all()
+        
+        category_stats = [(category, count) for category, count, _ in category_rows]
+        total_tasks = sum(count for _, count, _ in category_rows)
+        completed_tasks = sum(completed for _, _, completed in category_rows)
     
     return {
         "total_tasks": total_tasks,
@@ -573,7 +966,7 @@ async def get_task_analytics(
 async def cleanup_old_tasks(
     background_tasks: BackgroundTasks,
     days: int = Query(30, ge=1, le=365),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     background_tasks.add_task(task_service.cleanup_old_tasks, days)
     
@@ -594,30 +987,28 @@ async def internal_error_handler(request: Request, exc):
         content={"detail": "Internal server error"}
     )
 
-@app.on_event("startup")
-async def startup_event():
-    logger.info("FastAPI microservice starting up...")
-    logger.info("All services initialized successfully")
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    logger.info("FastAPI microservice shutting down...")
-    if cache_service.redis_client:
-        cache_service.redis_client.close()
-    logger.info("Cleanup completed")
-
 def run_demo():
     print("=== FastAPI Microservice Demo ===")
     print("Starting FastAPI server...")
     print("API Documentation: http://localhost:8000/docs")
     print("Health Check: http://localhost:8000/health")
     
+    loop = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+    if loop == "asyncio":
+        logger.info("uvloop is not installed; using the default asyncio event loop")
+    http = "httptools" if importlib.util.find_spec("httptools") else "h11"
+    if http == "h11":
+        logger.info("httptools is not installed; using the h11 HTTP parser")
+    
     uvicorn.run(
         "fastapi_microservice:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
-        log_level="info"
+        loop=loop,
+        http=http,
+        workers=os.cpu_count(),
+        reload=False,
+        log_level="warning"
     )
 
 if __name__ == "__main__":
@@ -1,11 +1,14 @@
 #!/usr/bin/env python3
 
 import asyncio
+import inspect
+import json
 import logging
-import pickle
+import os
+import re
 import sqlite3
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Protocol, Tuple, Union
@@ -13,23 +16,47 @@ import warnings
 
 import numpy as np
 import pandas as pd
-from sklearn.base import BaseEstimator, TransformerMixin
+import sklearn
+from sklearn.base import BaseEstimator, TransformerMixin, clone
 from sklearn.compose import ColumnTransformer
-from sklearn.ensemble import RandomForestClassifier, GradientBoostingRegressor
-from sklearn.feature_selection import SelectKBest, f_classif
-from sklearn.linear_model import LogisticRegression, LinearRegression
+from sklearn.ensemble import (
+    RandomForestClassifier, HistGradientBoostingClassifier, HistGradientBoostingRegressor
+)
+from sklearn.feature_selection import SelectFromModel
+from sklearn.linear_model import Lasso, LogisticRegression, LinearRegression
 from sklearn.metrics import (
     accuracy_score, classification_report, confusion_matrix,
     mean_squared_error, r2_score, roc_auc_score
 )
 from sklearn.model_selection import (
-    GridSearchCV, cross_val_score, train_test_split, StratifiedKFold
+    RandomizedSearchCV, cross_val_score, train_test_split, StratifiedKFold
 )
 from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import (
     StandardScaler, MinMaxScaler, LabelEncoder, OneHotEncoder
 )
 import joblib
+from scipy.stats import loguniform, randint
+
+try:
+    from sklearn.experimental import enable_halving_search_cv
+    from sklearn.model_selection import HalvingRandomSearchCV
+except ImportError:
+    HalvingRandomSearchCV = None
+
+try:
+    from numba import get_num_threads, njit, prange
+except ImportError:
+    njit = None
+    prange = range
+
+# scikit-learn 1.8 selects L1 through l1_ratio; older releases ignore l1_ratio
+# unless penalty='elasticnet' and need penalty='l1' instead
+_L1_LOGISTIC_PARAMS = (
+    {'l1_ratio': 1.0}
+    if tuple(map(int, re.match(r'(\d+)\.(\d+)', sklearn.__version__).groups())) >= (1, 8)
+    else {'penalty': 'l1'}
+)
 
 warnings.filterwarnings('ignore', category=UserWarning)
 
@@ -86,67 +113,147 @@ class MLModel(Protocol):
         ...
 
 class OutlierRemover(BaseEstimator, TransformerMixin):
-    def __init__(self, factor: float = 1.5):
+    def __init__(self, factor: float = 1.5, block_rows: int = 4096):
         self.factor = factor
+        self.block_rows = block_rows
         self.lower_bounds_ = None
         self.upper_bounds_ = None
     
     def fit(self, X: np.ndarray, y: Optional[np.ndarray] = None) -> 'OutlierRemover':
-        X = np.array(X)
+        X = np.asarray(X)
+        bounds_dtype = X.dtype if np.issubdtype(X.dtype, np.floating) else np.float64
         
-        Q1 = np.percentile(X, 25, axis=0)
-        Q3 = np.percentile(X, 75, axis=0)
+        Q1, Q3 = np.percentile(X, [25, 75], axis=0)
         IQR = Q3 - Q1
         
-        self.lower_bounds_ = Q1 - (self.factor * IQR)
-        self.upper_bounds_ = Q3 + (self.factor * IQR)
+        self.lower_bounds_ = np.ascontiguousarray(Q1 - (self.factor * IQR), dtype=bounds_dtype)
+        self.upper_bounds_ = np.ascontiguousarray(Q3 + (self.factor * IQR), dtype=bounds_dtype)
         
         return self
     
     def transform(self, X: np.ndarray) -> np.ndarray:
-        X = np.array(X)
-        mask = np.all(
-            (X >= self.lower_bounds_) & (X <= self.upper_bounds_),
-            axis=1
-        )
+        X = np.asarray(X)
+        n_rows = X.shape[0]
+        block_rows = max(1, min(n_rows, self.block_rows))
+        
+        mask = np.empty(n_rows, dtype=bool)
+        within = np.empty((block_rows, X.shape[1]), dtype=bool)
+        above_lower = np.empty_like(within)
+        
+        for start in range(0, n_rows, block_rows):
+            block = X[start:start + block_rows]
+            rows = len(block)
+            np.greater_equal(block, self.lower_bounds_, out=above_lower[:rows])
+            np.less_equal(block, self.upper_bounds_, out=within[:rows])
+            np.logical_and(within[:rows], above_lower[:rows], out=within[:rows])
+            within[:rows].all(axis=1, out=mask[start:start + rows])
+        
         return X[mask]
     
     def fit_transform(self, X: np.ndarray, y: Optional[np.ndarray] = None) -> np.ndarray:
         return self.fit(X, y).transform(X)
 
 class FeatureEngineer(BaseEstimator, TransformerMixin):
-    def __init__(self, create_interactions: bool = True, polynomial_degree: int = 2):
+    def __init__(self, create_interactions: bool = True, polynomial_degree: int = 2, dtype: type = np.float64):
         self.create_interactions = create_interactions
         self.polynomial_degree = polynomial_degree
+        self.dtype = dtype
         self.feature_names_ = None
+        self.numeric_columns_ = None
+        self.pair_left_ = None
+        self.pair_right_ = None
+        self.engineered_names_ = None
     
     def fit(self, X: pd.DataFrame, y: Optional[np.ndarray] = None) -> 'FeatureEngineer':
         self.feature_names_ = X.columns.tolist()
+        self.numeric_columns_ = X.select_dtypes(include=[np.number]).columns
+        self.pair_left_, self.pair_right_ = np.triu_indices(len(self.numeric_columns_), k=1)
+        pairs = list(zip(self.numeric_columns_[self.pair_left_], self.numeric_columns_[self.pair_right_]))
+        
+        names = []
+        
+        if len(pairs) > 0 and self.create_interactions:
+            names.extend(f'{col1}_x_{col2}' for col1, col2 in pairs)
+        
+        if self.polynomial_degree >= 2:
+            names.extend(f'{col}_squared' for col in self.numeric_columns_)
+        
+        if len(pairs) > 0:
+            names.extend(f'{col1}_div_{col2}' for col1, col2 in pairs)
+        
+        self.engineered_names_ = names
         return self
     
     def transform(self, X: pd.DataFrame) -> pd.DataFrame:
-        X_new = X.copy()
-        numeric_columns = X.select_dtypes(include=[np.number]).columns
+        if getattr(self, 'engineered_names_', None) is None:
+            return clone(self).fit(X).transform(X)
+        
+        if X.columns.tolist() != self.feature_names_:
+            X = X.reindex(columns=self.feature_names_)
         
-        if len(numeric_columns) > 1 and self.create_interactions:
-            for i, col1 in enumerate(numeric_columns):
-                for col2 in numeric_columns[i+1:]:
-                    X_new[f'{col1}_x_{col2}'] = X[col1] * X[col2]
+        values = X[self.numeric_columns_].to_numpy(dtype=self.dtype)
+        left, right = self.pair_left_, self.pair_right_
+        
+        blocks = []
+        
+        if len(left) > 0 and self.create_interactions:
+            blocks.append(values[:, left] * values[:, right])
         
         if self.polynomial_degree >= 2:
-            for col in numeric_columns:
-                X_new[f'{col}_squared'] = X[col] ** 2
-        
-        if len(numeric_columns) > 1:
-            for i, col1 in enumerate(numeric_columns):
-                for col2 in numeric_columns[i+1:]:
-                    with np.errstate(divide='ignore', invalid='ignore'):
-                        ratio = X[col1] / (X[col2] + 1e-8)
-                        X_new[f'{col1}_div_{col2}'] = np.where(
-                            np.isfinite(ratio), ratio, 0
-                        )
-        
-        return X_new
+            blocks.append(values * values)
+        
+        if len(left) > 0:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                ratio = values[:, left] / (values[:, right] + 1e-8)
+            blocks.append(np.nan_to_num(ratio, copy=False, nan=0.0, posinf=0.0, neginf=0.0))
+        
+        if not blocks:
+            return X.copy()
+        
+        engineered = pd.DataFrame(np.hstack(blocks), index=X.index, columns=self.engineered_names_, copy=False)
+        return pd.concat([X, engineered], axis=1)
+
+def _lerp(lower: float, upper: float, fraction: float) -> float:
+    if fraction >= 0.5:
+        return upper - (upper - lower) * (1.0 - fraction)
+    return lower + (upper - lower) * fraction
+
+def _iqr_outlier_counts(values: np.ndarray, factor: float) -> np.ndarray:
+    n_rows, n_cols = values.shape
+    counts = np.zeros(n_cols, dtype=np.int64)
+    
+    for j in prange(n_cols):
+        column = values[:, j]
+        present = column[~np.isnan(column)]
+        n = present.shape[0]
+        if n == 0:
+            continue
+        
+        q1_position = (n - 1) * 0.25
+        q3_position = (n - 1) * 0.75
+        q1_index = int(np.floor(q1_position))
+        q3_index = int(np.floor(q3_position))
+        order_stats = np.array([q1_index, min(q1_index + 1, n - 1), q3_index, min(q3_index + 1, n - 1)])
+        partitioned = np.partition(present, order_stats)
+        
+        q1 = _lerp(partitioned[order_stats[0]], partitioned[order_stats[1]], q1_position - q1_index)
+        q3 = _lerp(partitioned[order_stats[2]], partitioned[order_stats[3]], q3_position - q3_index)
+        lower_bound = q1 - factor * (q3 - q1)
+        upper_bound = q3 + factor * (q3 - q1)
+        
+        count = 0
+        for i in range(n_rows):
+            if column[i] < lower_bound or column[i] > upper_bound:
+                count += 1
+        counts[j] = count
+    
+    return counts
+
+if njit is not None:
+    _lerp = njit(cache=True)(_lerp)
+    _iqr_outlier_counts = njit(parallel=True, cache=True)(_iqr_outlier_counts)
+
+_PARALLEL_OUTLIER_COUNTS = njit is not None and get_num_threads() > 1
 
 class DataQualityAnalyzer:
     @staticmethod
@@ -155,21 +262,24 @@ class DataQualityAnalyzer:
         
         total_rows = len(df)
         missing_values = df.isnull().sum().to_dict()
-        duplicate_rows = df.duplicated().sum()
+        duplicate_rows = pd.util.hash_pandas_object(df, index=False).duplicated().sum()
         data_types = df.dtypes.astype(str).to_dict()
         
-        outliers = {}
         numeric_columns = df.select_dtypes(include=[np.number]).columns
+        numeric_values = df[numeric_columns].to_numpy(dtype=np.float64)
         
-        for col in numeric_columns:
-            Q1 = df[col].quantile(0.25)
-            Q3 = df[col].quantile(0.75)
+        if _PARALLEL_OUTLIER_COUNTS:
+            outlier_counts = _iqr_outlier_counts(numeric_values, 1.5)
+        else:
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', RuntimeWarning)
+                Q1, Q3 = np.nanpercentile(numeric_values, [25, 75], axis=0).reshape(2, -1)
             IQR = Q3 - Q1
-            lower_bound = Q1 - 1.5 * IQR
-            upper_bound = Q3 + 1.5 * IQR
+            lower_bounds = Q1 - 1.5 * IQR
+            upper_bounds = Q3 + 1.5 * IQR
             
-            outlier_count = len(df[(df[col] < lower_bound) | (df[col] > upper_bound)])
-            outliers[col] = outlier_count
+            outlier_counts = ((numeric_values < lower_bounds) | (numeric_values > upper_bounds)).sum(axis=0)
+        outliers = dict(zip(numeric_columns, outlier_counts.tolist()))
         
         missing_ratio = sum(missing_values.values()) / (total_rows * len(df.columns))
         duplicate_ratio = duplicate_rows / total_rows
@@ -199,14 +309,12 @@ class DataQualityAnalyzer:
         
         if strategy == 'auto':
             numeric_columns = df_clean.select_dtypes(include=[np.number]).columns
-            for col in numeric_columns:
-                df_clean[col].fillna(df_clean[col].median(), inplace=True)
+            df_clean[numeric_columns] = df_clean[numeric_columns].fillna(df_clean[numeric_columns].median())
             
             categorical_columns = df_clean.select_dtypes(include=['object']).columns
-            for col in categorical_columns:
-                mode_value = df_clean[col].mode()
-                if not mode_value.empty:
-                    df_clean[col].fillna(mode_value[0], inplace=True)
+            mode_values = df_clean[categorical_columns].mode()
+            if not mode_values.empty:
+                df_clean[categorical_columns] = df_clean[categorical_columns].fillna(mode_values.iloc[0].dropna())
         
         elif strategy == 'drop':
             df_clean = df_clean.dropna()
@@ -219,39 +327,49 @@ class ModelFactory:
         'logistic_regression': LogisticRegression,
         'random_forest_classifier': RandomForestClassifier,
         'linear_regression': LinearRegression,
-        'gradient_boosting_regressor': GradientBoostingRegressor
+        'gradient_boosting_regressor': HistGradientBoostingRegressor,
+        'hist_gbr': HistGradientBoostingRegressor,
+        'hist_gbc': HistGradientBoostingClassifier
     }
     
+    _ignores_n_jobs = (LogisticRegression,)
+    
     @classmethod
     def create_model(cls, model_type: str, **kwargs) -> Any:
         if model_type not in cls._models:
             raise ValueError(f"Unknown model type: {model_type}")
         
         model_class = cls._models[model_type]
+        if model_class not in cls._ignores_n_jobs and 'n_jobs' in inspect.signature(model_class).parameters:
+            kwargs.setdefault('n_jobs', -1)
+        
         return model_class(**kwargs)
     
     @classmethod
-    def get_default_hyperparameters(cls, model_type: str) -> Dict[str, List[Any]]:
+    def get_default_hyperparameters(cls, model_type: str) -> Dict[str, Any]:
         defaults = {
             'logistic_regression': {
-                'C': [0.1, 1.0, 10.0],
+                'C': loguniform(0.1, 10.0),
                 'solver': ['liblinear', 'lbfgs'],
                 'max_iter': [1000]
             },
             'random_forest_classifier': {
-                'n_estimators': [100, 200, 300],
+                'n_estimators': randint(100, 301),
                 'max_depth': [None, 10, 20, 30],
-                'min_samples_split': [2, 5, 10]
+                'min_samples_split': randint(2, 11)
             },
             'linear_regression': {
                 'fit_intercept': [True, False]
             },
-            'gradient_boosting_regressor': {
-                'n_estimators': [100, 200],
-                'learning_rate': [0.1, 0.05, 0.01],
-                'max_depth': [3, 5, 7]
+            'hist_gbr': {
+                'max_iter': randint(100, 201),
+                'learning_rate': loguniform(0.01, 0.1),
+                'max_leaf_nodes': randint(15, 64),
+                'l2_regularization': loguniform(1e-3, 1.0)
             }
         }
+        defaults['gradient_boosting_regressor'] = defaults['hist_gbr']
+        defaults['hist_gbc'] = defaults['hist_gbr']
         
         return defaults.get(model_type, {})
 
@@ -305,33 +423,39 @@ class ModelEvaluator:
         )
     
     @staticmethod
-    def cross_validate(model: Any, X: np.ndarray, y: np.ndarray, cv: int = 5) -> List[float]:
+    def cross_validate(model: Any, X: np.ndarray, y: np.ndarray, cv: int = 5, n_jobs: int = -1) -> List[float]:
         logger.info(f"Performing {cv}-fold cross-validation...")
         
-        scores = cross_val_score(model, X, y, cv=cv, scoring='accuracy')
+        scores = cross_val_score(model, X, y, cv=cv, scoring='accuracy', n_jobs=n_jobs, pre_dispatch='2*n_jobs')
         return scores.tolist()
 
 class MLPipeline:
     def __init__(self, config: ModelConfig):
         self.config = config
         self.preprocessor = None
+        self.feature_engineer = None
         self.model = None
         self.is_trained = False
         self.feature_names = None
+        self.numeric_features = None
+        self.categorical_features = None
         self.target_encoder = None
         self.metrics = None
     
-    def create_preprocessor(self, X: pd.DataFrame) -> ColumnTransformer:
+    def create_preprocessor(self, X: pd.DataFrame, numeric_features: Optional[List[str]] = None,
+                            categorical_features: Optional[List[str]] = None) -> ColumnTransformer:
         logger.info("Creating preprocessing pipeline...")
         
-        numeric_features = X.select_dtypes(include=[np.number]).columns.tolist()
-        categorical_features = X.select_dtypes(include=['object']).columns.tolist()
+        if numeric_features is None:
+            numeric_features = X.select_dtypes(include=[np.number]).columns.tolist()
+        if categorical_features is None:
+            categorical_features = X.select_dtypes(include=['object']).columns.tolist()
         
         transformers = []
         
         if numeric_features:
             numeric_transformer = Pipeline([
-                ('scaler', StandardScaler()),
+                ('scaler', StandardScaler(copy=False)),
                 ('outlier_remover', OutlierRemover())
             ])
             transformers.append(('num', numeric_transformer, numeric_features))
@@ -344,6 +468,11 @@ class MLPipeline:
         
         return ColumnTransformer(transformers=transformers, remainder='passthrough')
     
+    @staticmethod
+    def _narrow_floats(X: pd.DataFrame) -> pd.DataFrame:
+        float_columns = X.select_dtypes(include=['float64']).columns
+        return X.astype({column: np.float32 for column in float_columns})
+    
     def prepare_data(self, X: pd.DataFrame, y: pd.Series, 
                     test_size: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
         logger.info("Preparing data for training...")
@@ -357,10 +486,15 @@ class MLPipeline:
             y = y.loc[X_clean.index]
             X = X_clean
         
-        feature_engineer = FeatureEngineer()
-        X_engineered = feature_engineer.fit_transform(X)
+        self.feature_engineer = FeatureEngineer(dtype=np.float32)
+        self.feature_engineer.fit(X)
+        X_engineered = self._narrow_floats(self.feature_engineer.transform(X))
         
         self.feature_names = X_engineered.columns.tolist()
+        self.numeric_features = (
+            self.feature_engineer.numeric_columns_.tolist() + self.feature_engineer.engineered_names_
+        )
+        self.categorical_features = X.select_dtypes(include=['object']).columns.tolist()
         
         test_size = test_size or self.config.test_size
         X_train, X_test, y_train, y_test = train_test_split(
@@ -377,7 +511,7 @@ class MLPipeline:
         
         X_train, X_test, y_train, y_test = self.prepare_data(X, y)
         
-        self.preprocessor = self.create_preprocessor(X_train)
+        self.preprocessor = self.create_preprocessor(X_train, self.numeric_features, self.categorical_features)
         
         base_model = ModelFactory.create_model(
             self.config.model_type, 
@@ -387,29 +521,36 @@ class MLPipeline:
         
         pipeline_steps = [('preprocessor', self.preprocessor)]
         
-        if self.config.feature_selection:
+        if self.config.feature_selection and not self._is_tree_model():
             max_features = self.config.max_features or min(50, X_train.shape[1])
-            selector = SelectKBest(f_classif, k=max_features)
+            if self._is_classification():
+                selector_model = LogisticRegression(**_L1_LOGISTIC_PARAMS, solver='liblinear', C=0.1)
+            else:
+                selector_model = Lasso(alpha=0.01)
+            selector = SelectFromModel(selector_model, max_features=max_features, threshold=-np.inf)
             pipeline_steps.append(('selector', selector))
         
         pipeline_steps.append(('model', base_model))
         
         self.model = Pipeline(pipeline_steps)
         
-        if not self.config.hyperparameters:
-            self.model = self._tune_hyperparameters(X_train, y_train)
-        else:
-            self.model.fit(X_train, y_train)
-        
-        if self._is_classification():
-            self.metrics = ModelEvaluator.evaluate_classifier(self.model, X_test, y_test)
-        else:
-            self.metrics = ModelEvaluator.evaluate_regressor(self.model, X_test, y_test)
-        
-        cv_scores = ModelEvaluator.cross_validate(
-            self.model, X_train, y_train, cv=self.config.cross_validation_folds
-        )
-        self.metrics.cross_val_scores = cv_scores
+        with joblib.parallel_backend('loky', n_jobs=os.cpu_count()):
+            cv_scores = None
+            if not self.config.hyperparameters:
+                self.model, cv_scores = self._tune_hyperparameters(X_train, y_train)
+            else:
+                self.model.fit(X_train, y_train)
+            
+            if self._is_classification():
+                self.metrics = ModelEvaluator.evaluate_classifier(self.model, X_test, y_test)
+            else:
+                self.metrics = ModelEvaluator.evaluate_regressor(self.model, X_test, y_test)
+            
+            if cv_scores is None:
+                cv_scores = ModelEvaluator.cross_validate(
+                    self.model, X_train, y_train, cv=self.config.cross_validation_folds
+                )
+            self.metrics.cross_val_scores = cv_scores
         
         self.is_trained = True
         logger.info("Model training completed successfully")
@@ -420,8 +561,7 @@ class MLPipeline:
         if not self.is_trained:
             raise ValueError("Model must be trained before making predictions")
         
-        feature_engineer = FeatureEngineer()
-        X_engineered = feature_engineer.fit_transform(X)
+        X_engineered = self._narrow_floats(self.feature_engineer.transform(X))
         
         return self.model.predict(X_engineered)
     
@@ -432,8 +572,7 @@ class MLPipeline:
         if not self._is_classification():
             raise ValueError("predict_proba only available for classification models")
         
-        feature_engineer = FeatureEngineer()
-        X_engineered = feature_engineer.fit_transform(X)
+        X_engineered = self._narrow_floats(self.feature_engineer.transform(X))
         
         return self.model.predict_proba(X_engineered)
     
@@ -443,6 +582,7 @@ class MLPipeline:
         
         model_data = {
             'model': self.model,
+            'feature_engineer': self.feature_engineer,
             'config': self.config,
             'feature_names': self.feature_names,
             'metrics': self.metrics,
@@ -458,6 +598,7 @@ class MLPipeline:
         
         pipeline = cls(model_data['config'])
         pipeline.model = model_data['model']
+        pipeline.feature_engineer = model_data.get('feature_engineer', FeatureEngineer())
         pipeline.feature_names = model_data['feature_names']
         pipeline.metrics = model_data['metrics']
         pipeline.is_trained = model_data['is_trained']
@@ -466,36 +607,62 @@ class MLPipeline:
         return pipeline
     
     def _is_classification(self) -> bool:
-        classification_models = ['logistic_regression', 'random_forest_classifier']
+        classification_models = ['logistic_regression', 'random_forest_classifier', 'hist_gbc']
         return self.config.model_type in classification_models
     
-    def _tune_hyperparameters(self, X_train: np.ndarray, y_train: np.ndarray) -> Pipeline:
+    def _is_tree_model(self) -> bool:
+        tree_models = ['random_forest_classifier', 'gradient_boosting_regressor', 'hist_gbr', 'hist_gbc']
+        return self.config.model_type in tree_models
+    
+    def _tune_hyperparameters(self, X_train: np.ndarray,
+                              y_train: np.ndarray) -> Tuple[Pipeline, Optional[List[float]]]:
         logger.info("Performing hyperparameter tuning...")
         
-        param_grid = {}
+        param_distributions = {}
         default_params = ModelFactory.get_default_hyperparameters(self.config.model_type)
         
         for param, values in default_params.items():
-            param_grid[f'model__{param}'] = values
-        
-        if param_grid:
-            cv_strategy = StratifiedKFold(n_splits=3) if self._is_classification() else 3
+            param_distributions[f'model__{param}'] = values
+        
+        if param_distributions:
+            n_splits = self.config.cross_validation_folds
+            cv_strategy = StratifiedKFold(n_splits=n_splits) if self._is_classification() else n_splits
+            search_options = {
+                'cv': cv_strategy,
+                'scoring': 'accuracy' if self._is_classification() else 'neg_mean_squared_error',
+                'n_jobs': -1,
+                'random_state': self.config.random_state
+            }
             
-            grid_search = GridSearchCV(
-                self.model,
-                param_grid,
-                cv=cv_strategy,
-                scoring='accuracy' if self._is_classification() else 'neg_mean_squared_error',
-                n_jobs=-1
-            )
+            if HalvingRandomSearchCV is not None:
+                search = HalvingRandomSearchCV(
+                    self.model,
+                    param_distributions,
+                    n_candidates=27,
+                    factor=3,
+                    resource='n_samples',
+                    min_resources='exhaust',
+                    **search_options
+                )
+            else:
+                search = RandomizedSearchCV(
+                    self.model,
+                    param_distributions,
+                    n_iter=10,
+                    **search_options
+                )
             
-            grid_search.fit(X_train, y_train)
-            logger.info(f"Best parameters: {grid_search.best_params_}")
+            search.fit(X_train, y_train)
+            logger.info(f"Best parameters: {search.best_params_}")
             
-            return grid_search.best_estimator_
+            cv_scores = [
+                float(search.cv_results_[f'split{i}_test_score'][search.best_index_])
+                for i in range(search.n_splits_)
+            ]
+            return search.best_estimator_, cv_scores
         else:
             self.model.fit(X_train, y_train)
-            return self.model
+            return self.model, None
 
 class DataGenerator:
     @staticmethod
@@ -549,38 +716,46 @@ class DataGenerator:
 class ModelMonitor:
     def __init__(self, reference_data: pd.DataFrame):
         self.reference_data = reference_data
+        self.reference_columns = reference_data.select_dtypes(include=[np.number]).columns
         self.reference_stats = self._compute_stats(reference_data)
+        self.reference_mean = np.array(
+            [self.reference_stats[column]['mean'] for column in self.reference_columns], dtype=np.float64
+        )
     
     def _compute_stats(self, data: pd.DataFrame) -> Dict[str, Dict[str, float]]:
-        stats = {}
-        
-        for column in data.select_dtypes(include=[np.number]).columns:
-            stats[column] = {
-                'mean': data[column].mean(),
-                'std': data[column].std(),
-                'min': data[column].min(),
-                'max': data[column].max(),
-                'q25': data[column].quantile(0.25),
-                'q75': data[column].quantile(0.75)
+        numeric_columns = data.select_dtypes(include=[np.number]).columns
+        values = data[numeric_columns].to_numpy(dtype=np.float64)
+        
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            column_stats = {
+                'mean': np.nanmean(values, axis=0),
+                'std': np.nanstd(values, axis=0, ddof=1),
+                'min': np.nanmin(values, axis=0),
+                'max': np.nanmax(values, axis=0)
             }
+            column_stats['q25'], column_stats['q75'] = np.nanpercentile(values, [25, 75], axis=0).reshape(2, -1)
         
-        return stats
+        return {
+            column: {name: float(stat[i]) for name, stat in column_stats.items()}
+            for i, column in enumerate(numeric_columns)
+        }
     
     def detect_drift(self, new_data: pd.DataFrame, threshold: float = 0.1) -> Dict[str, bool]:
-        new_stats = self._compute_stats(new_data)
-        drift_detected = {}
-        
-        for column in self.reference_stats:
-            if column in new_stats:
-                ref_mean = self.reference_stats[column]['mean']
-                new_mean = new_stats[column]['mean']
-                
-                relative_change = abs(new_mean - ref_mean) / (abs(ref_mean) + 1e-8)
-                drift_detected[column] = relative_change > threshold
-            else:
-                drift_detected[column] = True
+        new_numeric_columns = new_data.select_dtypes(include=[np.number]).columns
+        present = self.reference_columns.isin(new_numeric_columns)
+        
+        new_mean = np.full(len(self.reference_columns), np.nan)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            new_mean[present] = np.nanmean(
+                new_data[self.reference_columns[present]].to_numpy(dtype=np.float64), axis=0
+            )
+        
+        relative_change = np.abs(new_mean - self.reference_mean) / (np.abs(self.reference_mean) + 1e-8)
+        drift_detected = (relative_change > threshold) | ~present
         
-        return drift_detected
+        return dict(zip(self.reference_columns, drift_detected.tolist()))
 
 class AsyncMLPipeline:
     def __init__(self, config: ModelConfig):
@@ -592,7 +767,7 @@ class AsyncMLPipeline:
         logger.info("Starting asynchronous training...")
         
         if len(X) <= batch_size:
-            return self.pipeline.train(X, y)
+            return await asyncio.to_thread(self.pipeline.train, X, y)
         
         total_batches = len(X) // batch_size + (1 if len(X) % batch_size > 0 else 0)
         
@@ -605,23 +780,40 @@ class AsyncMLPipeline:
             
             logger.info(f"Processing batch {i + 1}/{total_batches}")
             
-            await asyncio.sleep(0.1)
-            
             if i == 0:
-                self.pipeline.train(X_batch, y_batch)
+                await asyncio.to_thread(self.pipeline.train, X_batch, y_batch)
             else:
                 logger.info(f"Batch {i + 1} processed (incremental learning not shown)")
         
         return self.pipeline.metrics
 
 class ModelRegistry:
+    _INSERT_MODEL_SQL = """
+        INSERT OR REPLACE INTO models 
+        (name, version, model_type, file_path, metrics, is_active)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """
+    _SELECT_VERSION_SQL = "SELECT file_path FROM models WHERE name = ? AND version = ?"
+    _SELECT_ACTIVE_SQL = "SELECT file_path FROM models WHERE name = ? AND is_active = TRUE"
+    _LIST_MODELS_SQL = """
+        SELECT name, version, model_type, metrics, created_at, is_active 
+        FROM models ORDER BY created_at DESC
+    """
+    
     def __init__(self, registry_path: str = "model_registry.db"):
         self.registry_path = registry_path
+        self._conn = sqlite3.connect(registry_path, check_same_thread=False)
+        self._conn.executescript("""
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            PRAGMA temp_store=MEMORY;
+            PRAGMA mmap_size=268435456;
+        """)
         self._init_database()
     
     def _init_database(self) -> None:
-        with sqlite3.connect(self.registry_path) as conn:
-            conn.execute("""
+        with self._conn:
+            self._conn.execute("""
                 CREATE TABLE IF NOT EXISTS models (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     name TEXT NOT NULL,
@@ -634,50 +826,47 @@ class ModelRegistry:
                     UNIQUE(name, version)
                 )
             """)
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_models_name_active ON models(name, is_active)"
+            )
     
     def register_model(self, name: str, version: str, pipeline: MLPipeline, 
                       file_path: str, is_active: bool = False) -> None:
         pipeline.save_model(file_path)
         
-        with sqlite3.connect(self.registry_path) as conn:
-            metrics_json = pickle.dumps(pipeline.metrics) if pipeline.metrics else None
-            
-            conn.execute("""
-                INSERT OR REPLACE INTO models 
-                (name, version, model_type, file_path, metrics, is_active)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (name, version, pipeline.config.model_type, file_path, metrics_json, is_active))
+        metrics_json = json.dumps(asdict(pipeline.metrics), default=float) if pipeline.metrics else None
+        
+        with self._conn:
+            self._conn.execute(
+                self._INSERT_MODEL_SQL,
+                (name, version, pipeline.config.model_type, file_path, metrics_json, is_active)
+            )
         
         logger.info(f"Model {name} v{version} registered successfully")
     
     def get_model(self, name: str, version: str = None) -> Optional[MLPipeline]:
-        with sqlite3.connect(self.registry_path) as conn:
-            if version:
-                cursor = conn.execute(
-                    "SELECT file_path FROM models WHERE name = ? AND version = ?",
-                    (name, version)
-                )
-            else:
-                cursor = conn.execute(
-                    "SELECT file_path FROM models WHERE name = ? AND is_active = TRUE",
-                    (name,)
-                )
-            
-            result = cursor.fetchone()
-            if result:
-                return MLPipeline.load_model(result[0])
+        if version:
+            cursor = self._conn.execute(self._SELECT_VERSION_SQL, (name, version))
+        else:
+            cursor = self._conn.execute(self._SELECT_ACTIVE_SQL, (name,))
+        
+        result = cursor.fetchone()
+        if result:
+            return MLPipeline.load_model(result[0])
         
         return None
     
     def list_models(self) -> List[Dict[str, Any]]:
-        with sqlite3.connect(self.registry_path) as conn:
-            cursor = conn.execute("""
-                SELECT name, version, model_type, created_at, is_active 
-                FROM models ORDER BY created_at DESC
-            """)
-            
-            columns = [desc[0] for desc in cursor.description]
-            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+        cursor = self._conn.execute(self._LIST_MODELS_SQL)
+        
+        columns = [desc[0] for desc in cursor.description]
+        models = [dict(zip(columns, row)) for row in cursor.fetchall()]
+        
+        for model in models:
+            metrics = model['metrics']
+            model['metrics'] = json.loads(metrics) if isinstance(metrics, str) else None
+        
+        return models
 
 def demonstrate_ml_pipeline():
     logger.info("Starting ML Pipeline demonstration...")